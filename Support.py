@@ -1,43 +1,10 @@
 import tkinter as tk
 from typing import Union
 
-# Model Constants
-TANK_RANGE = 5
-SCORPION_RANGE = 2
-FIREFLY_RANGE = 5
-
-MAX_BUILDING_HEALTH = 9
-
-TILE_NAME = "Tile"
-TILE_SYMBOL = "T"
-GROUND_NAME = "Ground"
-GROUND_SYMBOL = " "
-MOUNTAIN_NAME = "Mountain"
-MOUNTAIN_SYMBOL = "M"
-BUILDING_NAME = "Building"
-
-ENTITY_NAME = "Entity"
-ENTITY_SYMBOL = "E"
-MECH_NAME = "Mech"
-MECH_SYMBOL = "M"
-ENEMY_NAME = "Enemy"
-ENEMY_SYMBOL = "N"
-TANK_NAME = "TankMech"
-TANK_SYMBOL = "T"
-HEAL_NAME = "HealMech"
-HEAL_SYMBOL = "H"
-SCORPION_NAME = "Scorpion"
-SCORPION_SYMBOL = "S"
-FIREFLY_NAME = "Firefly"
-FIREFLY_SYMBOL = "F"
-
-TANK_DISPLAY = "\U000023F8"
-HEAL_DISPLAY = "\U0001F6E1"
-SCORPION_DISPLAY = "\U00010426"
-FIREFLY_DISPLAY = "\U00000D9E"
-
-# Used to get attack tiles for various entities
-PLUS_OFFSETS = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+# The model constants and get_distance live in the tkinter-free breach
+# package, and are re-exported here for the view.
+from breach.constants import *
+from breach.pathfinding import get_distance
 
 # GUI Constants
 GRID_SIZE = 450
@@ -51,6 +18,8 @@ SIDEBAR_HEADINGS = ("Unit", "Coord", "Hp", "Dmg")
 SAVE_TEXT = "Save Game"
 LOAD_TEXT = "Load Game"
 UNDO_TEXT = "Undo Move"
+REDO_TEXT = "Redo Move"
+SUGGEST_TEXT = "Suggest Move"
 TURN_TEXT = "End Turn"
 
 INVALID_SAVE_TITLE = "Cannot Save!"
@@ -58,10 +27,13 @@ INVALID_SAVE_MESSAGE = "You can only save at the beginning of your turn!"
 IO_ERROR_TITLE = "File Error"
 IO_ERROR_MESSAGE = "Cannot open specified file: "
 PLAY_AGAIN_TEXT = "Would you like to play again?"
+NO_SUGGESTION_TITLE = "No Suggestion"
+NO_SUGGESTION_MESSAGE = "No move does better than ending your turn now."
 
 BANNER_FONT = ("Arial", 22, "bold")
 ENTITY_FONT = ("Arial", 20, "bold")
 SIDEBAR_FONT = ("Arial", 14, "bold")
+PREVIEW_FONT = ("Arial", 10, "bold")
 
 ATTACK_COLOR = "Red"
 MOVE_COLOR = "Lime"
@@ -69,6 +41,8 @@ GROUND_COLOR = "SandyBrown"
 BUILDING_COLOR = "Turquoise"
 DESTROYED_COLOR = "Teal"
 MOUNTAIN_COLOR = "Olive"
+PREVIEW_DAMAGE_COLOR = "DarkRed"
+PREVIEW_MOVE_COLOR = "Purple"
 
 
 class AbstractGrid(tk.Canvas):
@@ -183,66 +157,3 @@ class AbstractGrid(tk.Canvas):
     def clear(self):
         """Clears all child widgets off the canvas."""
         self.delete("all")
-
-
-# Note: "" just allows type hint despite BreachModel not being defined in file.
-def get_distance(
-    game_state: "BreachModel", origin: tuple[int, int], destination: tuple[int, int]
-) -> int:
-    """
-    Computes the minimum taxicab distance between two points on a given board,
-    from all paths that avoid blocking tiles and other entities. The method may
-    begin on an entity or blocking tile, but will avoid all such tiles while
-    searching possible paths. This method requires you to have gotten up to the
-    BreachModel class, with correct get_board, get_entity, and entity_position
-    methods.
-
-    Args:
-        game_state (BreachModel): Model representing gamestate
-        origin (tuple[int,int]): starting position.
-        destination (tuple[int,int]): ending position. Precondition: will not be
-                                      a blocking tile according to game_state,
-                                      and will not posess an entity according to
-                                      game_state
-
-    Returns:
-        int: taxicab distance of shortest path within the given game board
-             between origin and destination such that blocking tiles and entities
-             are avoided, or -1 if no such path exists.
-    """
-    # Implements A* search algorithm.
-    # NOTE: YOU DO NOT NEED TO UNDERSTAND THIS ALGORITHM
-    entity_tiles = set(game_state.entity_positions().keys())
-    # Initialise
-    searched = set()
-    frontier = {origin: 0}
-
-    while len(frontier) > 0:
-        # get minimum frontier node
-        min = float("inf")
-        node = None
-        for key, val in frontier.items():
-            if val < min:
-                node = key
-                min = val
-        # Move node to searched pile
-        value = frontier.pop(node)
-        searched.add(node)
-
-        if node == destination:
-            return value
-        else:
-            # Add children to frontier
-            new_val = value + 1
-            for delta in PLUS_OFFSETS:
-                new_node = (node[0] + delta[0], node[1] + delta[1])
-                if (
-                    (new_node not in searched)
-                    and (new_node not in entity_tiles)
-                    and not (game_state.get_board().get_tile(new_node).is_blocking())
-                    and not (frontier.get(new_node, float("inf")) <= new_val)
-                ):
-                    frontier[new_node] = new_val
-
-    # We have run out of paths
-    return -1
@@ -0,0 +1,21 @@
+"""The Into The Breach game model, usable without tkinter.
+
+The GUI in "Into The Breach.py" is built on top of this package, and it can be
+imported on its own by headless tools such as simulations.
+"""
+from breach.constants import *
+from breach.tiles import Tile, Ground, Mountain, Building
+from breach.board import Board, CompactBoard
+from breach.entities import (
+    Entity, Mech, TankMech, HealMech, Enemy, Scorpion, Firefly
+)
+from breach.model import BreachModel, TurnPreview
+from breach.levels import (
+    LevelError, LevelTemplate, read_file, load_level, clear_level_cache
+)
+from breach.pack import LevelPack, open_pack, write_pack
+from breach.binary import (
+    BINARY_EXTENSION, read_binary, write_binary, load_binary
+)
+from breach.pathfinding import get_distance
+from breach.planner import Planner, plan_moves, apply_plan
@@ -0,0 +1,282 @@
+"""Batch runner that plays many independent games across all cores.
+
+Every combination of level, policy and seed is played once by
+simulate.run_game in a pool of worker processes. Results are streamed as JSON
+lines as soon as each game finishes, and a summary with win rate, mean turns,
+building and mech survival and throughput is written at the end:
+
+    python -m breach.batch levels/level1.txt levels/level2.txt \
+        --policies greedy random --seeds 1000
+
+Games are sent to the workers in chunks, a few per worker by default, so
+that a batch of short games is not dominated by the cost of passing each game
+between processes. A game that raises an exception is reported as an error
+record. If a worker process dies outright, the games of every chunk that had
+not finished are retried each in their own process, so one crashing game
+cannot take down the batch.
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import time
+import traceback
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+)
+from concurrent.futures.process import BrokenProcessPool
+from itertools import product
+from typing import Iterator, Optional
+
+from breach.pack import PACK_EXTENSION, PACK_SEPARATOR, open_pack
+from breach.planner import DEFAULT_TIME_BUDGET
+from breach.simulate import (
+    DEFAULT_MAX_TURNS, WIN, LOSS, UNFINISHED, run_game
+)
+
+ERROR = "error"
+# Chunks each worker is given by default, so that workers that finish early
+# can take on more games while slower chunks are still running
+CHUNKS_PER_WORKER = 4
+
+
+def _run_chunk(games: list[tuple], options: dict) -> list[dict]:
+    """Plays each of <games> in this worker process, turning any exception
+    into an error record.
+
+    Parameters:
+        games: (level file, policy name, seed) for each game.
+        options: Keyword arguments for simulate.run_game.
+    """
+    records = []
+    for level_file, policy_name, seed in games:
+        try:
+            record = run_game(level_file, policy_name, seed, **options)
+        except Exception:
+            record = _error_record(
+                (level_file, policy_name, seed), traceback.format_exc()
+            )
+        records.append(record)
+    return records
+
+
+def run_batch(
+    games: list[tuple[str, str, int]],
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    **options
+) -> Iterator[dict]:
+    """Plays <games> in a pool of worker processes, yielding each game's
+    record as soon as it finishes (so not in the order given).
+
+    Parameters:
+        games: (level file, policy name, seed) for each game.
+        workers: Number of worker processes (default: one per core).
+        chunk_size: Number of games sent to a worker at a time (default:
+                    enough for CHUNKS_PER_WORKER chunks per worker).
+        options: Further keyword arguments for simulate.run_game.
+    """
+    workers = workers or os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(
+            1, math.ceil(len(games) / (workers * CHUNKS_PER_WORKER))
+        )
+    unfinished = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_run_chunk, games[start:start + chunk_size], options):
+                games[start:start + chunk_size]
+            for start in range(0, len(games), chunk_size)
+        }
+        for future in as_completed(futures):
+            try:
+                yield from future.result()
+            except BrokenProcessPool:
+                # A worker died and took the pool with it, so every game that
+                # had not finished is played again in isolation
+                unfinished.extend(futures[future])
+            except Exception:
+                for game in futures[future]:
+                    yield _error_record(game, traceback.format_exc())
+    yield from _run_isolated(unfinished, workers, options)
+
+
+def _run_isolated(
+    games: list[tuple[str, str, int]],
+    workers: int,
+    options: dict
+) -> Iterator[dict]:
+    """Plays each of <games> in a process of its own, at most <workers> at a
+    time, so that a crash only affects the game that caused it.
+
+    Parameters:
+        games: (level file, policy name, seed) for each game.
+        workers: Maximum number of processes to run at once.
+        options: Further keyword arguments for simulate.run_game.
+    """
+    queue = deque(games)
+    running = {}
+    while queue or running:
+        while queue and len(running) < workers:
+            game = queue.popleft()
+            pool = ProcessPoolExecutor(max_workers=1)
+            running[pool.submit(_run_chunk, [game], options)] = (game, pool)
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            game, pool = running.pop(future)
+            pool.shutdown()
+            try:
+                yield from future.result()
+            except BrokenProcessPool:
+                yield _error_record(game, "worker process died")
+            except Exception:
+                yield _error_record(game, traceback.format_exc())
+
+
+def _error_record(game: tuple[str, str, int], error: str) -> dict:
+    """Returns the record for a game that could not be played."""
+    level_file, policy_name, seed = game
+    return {
+        "level": level_file,
+        "policy": policy_name,
+        "seed": seed,
+        "result": ERROR,
+        "error": error
+    }
+
+
+class BatchStats():
+    """Running totals over game records, overall and per (level, policy)."""
+
+    def __init__(self) -> None:
+        """Constructs empty statistics."""
+        self._totals = {}
+        self._start = time.perf_counter()
+
+    def add(self, record: dict) -> None:
+        """Adds the outcome of one game.
+
+        Parameters:
+            record: A record from run_batch.
+        """
+        for key in ("all", f"{record['level']} {record['policy']}"):
+            totals = self._totals.setdefault(key, {
+                "games": 0, WIN: 0, LOSS: 0, UNFINISHED: 0, ERROR: 0,
+                "turns": 0, "buildings": 0, "initial_buildings": 0,
+                "mechs": 0, "initial_mechs": 0
+            })
+            totals["games"] += 1
+            totals[record["result"]] += 1
+            if record["result"] != ERROR:
+                for field in ("turns", "buildings", "initial_buildings",
+                              "mechs", "initial_mechs"):
+                    totals[field] += record[field]
+
+    def summary(self) -> dict:
+        """Returns the aggregated statistics, including the throughput in
+        games per second since these statistics were created."""
+        elapsed = time.perf_counter() - self._start
+        summary = {}
+        for key, totals in self._totals.items():
+            played = totals["games"] - totals[ERROR]
+            summary[key] = {
+                "games": totals["games"],
+                "wins": totals[WIN],
+                "losses": totals[LOSS],
+                "unfinished": totals[UNFINISHED],
+                "errors": totals[ERROR],
+                "win_rate": totals[WIN] / played if played else None,
+                "mean_turns": totals["turns"] / played if played else None,
+                "building_survival": _ratio(
+                    totals["buildings"], totals["initial_buildings"]
+                ),
+                "mech_survival": _ratio(
+                    totals["mechs"], totals["initial_mechs"]
+                )
+            }
+        games = self._totals.get("all", {}).get("games", 0)
+        return {
+            "elapsed": elapsed,
+            "games_per_second": games / elapsed if elapsed else None,
+            "stats": summary
+        }
+
+
+def _ratio(part: int, whole: int) -> Optional[float]:
+    """Returns part / whole, or None if whole is 0."""
+    return part / whole if whole else None
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Runs the batch runner from the command line."""
+    parser = argparse.ArgumentParser(
+        description="Play many Into The Breach games across all cores."
+    )
+    parser.add_argument(
+        "levels",
+        nargs="+",
+        help="level files to play; a level pack stands for every level in it"
+    )
+    parser.add_argument("--policies", nargs="+", default=["greedy"])
+    parser.add_argument(
+        "--seeds",
+        type=int,
+        default=1,
+        help="games per level and policy, with seeds 0, 1, ..."
+    )
+    parser.add_argument("--workers", type=int, help="default: one per core")
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        help=f"games sent to a worker at a time (default: enough for "
+             f"{CHUNKS_PER_WORKER} chunks per worker)"
+    )
+    parser.add_argument("--moves", help="JSON move list for scripted games")
+    parser.add_argument("--max-turns", type=int, default=DEFAULT_MAX_TURNS)
+    parser.add_argument("--compact", action="store_true")
+    parser.add_argument("--vectorized", action="store_true")
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        default=DEFAULT_TIME_BUDGET,
+        help="seconds the planner policy searches for each turn"
+    )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="only write the summary"
+    )
+    args = parser.parse_args(argv)
+
+    levels = []
+    for level_file in args.levels:
+        if level_file.endswith(PACK_EXTENSION):
+            levels.extend(
+                f"{level_file}{PACK_SEPARATOR}{index}"
+                for index in range(len(open_pack(level_file)))
+            )
+        else:
+            levels.append(level_file)
+    games = list(product(levels, args.policies, range(args.seeds)))
+    stats = BatchStats()
+    for record in run_batch(
+        games,
+        args.workers,
+        args.chunk_size,
+        moves_file=args.moves,
+        max_turns=args.max_turns,
+        compact=args.compact,
+        vectorized=args.vectorized,
+        time_budget=args.time_budget
+    ):
+        stats.add(record)
+        if not args.quiet:
+            sys.stdout.write(json.dumps(record) + "\n")
+            sys.stdout.flush()
+    sys.stderr.write(json.dumps(stats.summary(), indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,484 @@
+"""Benchmark suite for the model's hot paths.
+
+Times get_distance, get_valid_movement_positions, move_enemies, make_attack,
+end_turn, read_file and GameGrid.redraw on the bundled levels and on
+generated boards of several sizes and entity densities, and writes the
+results as JSON:
+
+    python -m breach.benchmark --output results.json
+
+A saved result file can be used as a baseline. Compare mode runs the suite
+again (or loads a second result file) and flags every operation whose fastest
+time grew by more than the threshold, exiting with status 1 if any did:
+
+    python -m breach.benchmark --compare baseline.json
+    python -m breach.benchmark --compare baseline.json results.json
+
+GameGrid.redraw needs a display, so it is skipped when tkinter cannot open
+one. When NumPy is installed, the vectorized end_turn is timed as well, and
+every level (including a chain of scorpions that each kill the next, the
+worst case for the vectorized attack phase) is first checked to end the turn
+exactly as the sequential end_turn does.
+"""
+import argparse
+import glob
+import importlib.util
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Optional
+
+from breach.constants import *
+from breach import combat
+from breach.board import Board, CompactBoard
+from breach.generate import generate_level
+from breach.levels import read_file
+from breach.model import BreachModel
+from breach.pathfinding import get_distance
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LEVELS = sorted(glob.glob(os.path.join(ROOT, "levels", "*.txt")))
+GUI_FILE = os.path.join(ROOT, "Into The Breach.py")
+
+DEFAULT_SIZES = (10, 50, 100, 250, 500)
+# Fraction of the board's cells holding an entity
+DEFAULT_DENSITIES = (0.001, 0.004)
+MOUNTAIN_DENSITY = 0.1
+BUILDING_DENSITY = 0.02
+# Number of get_distance queries timed together
+DISTANCE_QUERIES = 20
+# Operations are repeated until they have run for at least MIN_TIME seconds,
+# MAX_REPEATS times, or MAX_TIME seconds have passed including their setup
+MIN_TIME = 0.2
+MAX_REPEATS = 50
+MAX_TIME = 2.0
+DEFAULT_THRESHOLD = 0.2
+# Number of scorpions in the kill chain level
+KILL_CHAIN_LENGTH = 1000
+
+OPERATIONS = (
+    "read_file",
+    "get_distance",
+    "get_valid_movement_positions",
+    "move_enemies",
+    "make_attack",
+    "end_turn",
+    "end_turn_vectorized",
+    "redraw"
+)
+
+
+def write_level(
+    level_file: str,
+    size: int,
+    density: float,
+    seed: int = 0
+) -> None:
+    """Writes a random square level to <level_file> with generate_level.
+
+    Parameters:
+        level_file: The file to write.
+        size: The number of rows and columns.
+        density: The fraction of cells to place entities on, half of them
+                 mechs and half enemies, split evenly between the types.
+        seed: Seed for the random layout.
+    """
+    units = max(4, int(size * size * density))
+    mechs, enemies = (units + 1) // 2, units // 2
+    with open(level_file, "w") as file:
+        generate_level(
+            file,
+            size,
+            size,
+            MOUNTAIN_DENSITY,
+            buildings=max(1, int((size - 2) ** 2 * BUILDING_DENSITY)),
+            entities={
+                TANK_SYMBOL: (mechs + 1) // 2,
+                HEAL_SYMBOL: mechs // 2,
+                SCORPION_SYMBOL: (enemies + 1) // 2,
+                FIREFLY_SYMBOL: enemies // 2
+            },
+            seed=seed
+        )
+
+
+def write_kill_chain(level_file: str, length: int) -> None:
+    """Writes a level to <level_file> holding a staircase of <length>
+    scorpions with 1 health, each in range of only the one before and the
+    one after it. Each scorpion that attacks kills the next, which then does
+    not attack, so whether each one attacks depends on every one before it.
+
+    Parameters:
+        level_file: The file to write.
+        length: The number of scorpions.
+    """
+    size = length // 2 + 4
+    rows = [
+        MOUNTAIN_SYMBOL * size if row in (0, size - 1)
+        else MOUNTAIN_SYMBOL + GROUND_SYMBOL * (size - 2) + MOUNTAIN_SYMBOL
+        for row in range(size)
+    ]
+    # A building and a tank in the bottom corners, out of the chain's reach
+    rows[size - 2] = (
+        MOUNTAIN_SYMBOL + "3" + GROUND_SYMBOL * (size - 3) + MOUNTAIN_SYMBOL
+    )
+    entities = [f"{TANK_SYMBOL},{size - 2},{size - 2},5,3,3"]
+    for index in range(length):
+        row, col = 1 + index // 2, 1 + (index + 1) // 2
+        entities.append(f"{SCORPION_SYMBOL},{row},{col},1,1,1")
+    with open(level_file, "w") as file:
+        file.write("\n".join(rows) + "\n\n" + "\n".join(entities) + "\n")
+
+
+def _measure(
+    run: Callable[[object], None],
+    setup: Callable[[], object] = lambda: None
+) -> list[float]:
+    """Returns the wall times of repeated calls to run(setup()). Only run is
+    timed. It is called at least once, and then until it has taken MIN_TIME
+    in total, been called MAX_REPEATS times or MAX_TIME has passed.
+
+    Parameters:
+        run: The operation to time.
+        setup: Returns the argument to a fresh call of <run>.
+    """
+    times = []
+    began = time.perf_counter()
+    while not times or (
+        sum(times) < MIN_TIME
+        and len(times) < MAX_REPEATS
+        and time.perf_counter() - began < MAX_TIME
+    ):
+        argument = setup()
+        start = time.perf_counter()
+        run(argument)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def _load(level_file: str, compact: bool) -> BreachModel:
+    """Returns a new game loaded from <level_file>."""
+    tiles, entities = read_file(level_file)
+    board_type = CompactBoard if compact else Board
+    return BreachModel(board_type(tiles), entities)
+
+
+def _distance_queries(
+    model: BreachModel,
+    seed: int
+) -> list[tuple[tuple[int, int], tuple[int, int]]]:
+    """Returns DISTANCE_QUERIES (origin, destination) pairs from an entity to
+    a free, non-blocking cell."""
+    rng = random.Random(seed)
+    board = model.get_board()
+    rows, columns = board.get_dimensions()
+    occupied = model.entity_positions()
+    free = [
+        (row, col) for row in range(rows) for col in range(columns)
+        if (row, col) not in occupied
+        and not board.get_tile((row, col)).is_blocking()
+    ]
+    origins = [entity.get_position() for entity in model.get_entities()]
+    return [
+        (rng.choice(origins), rng.choice(free))
+        for _ in range(DISTANCE_QUERIES)
+    ]
+
+
+def _open_grid() -> Optional[Callable[[BreachModel], None]]:
+    """Returns a function that redraws a game on a GameGrid, or None if the
+    GUI cannot be loaded (for example, because there is no display)."""
+    try:
+        import tkinter as tk
+    except ImportError:
+        return None
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        return None
+    root.withdraw()
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    spec = importlib.util.spec_from_file_location("into_the_breach", GUI_FILE)
+    gui = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(gui)
+
+    def redraw(model: BreachModel) -> None:
+        board = model.get_board()
+        grid = gui.GameGrid(root, board.get_dimensions(),
+                            (gui.GRID_SIZE, gui.GRID_SIZE))
+        grid.redraw(board, model.get_entities(), [])
+        grid.destroy()
+
+    return redraw
+
+
+def benchmark_level(
+    level_file: str,
+    compact: bool = False,
+    redraw: Optional[Callable[[BreachModel], None]] = None,
+    seed: int = 0
+) -> dict[str, list[float]]:
+    """Times every operation on the level in <level_file>.
+
+    Parameters:
+        level_file: The level to benchmark.
+        compact: If True, the board is a CompactBoard.
+        redraw: Redraws a game on a GameGrid, or None to skip the redraw.
+        seed: Seed for the get_distance queries.
+
+    Returns:
+        dict[str, list[float]]: The times of each run of each operation.
+    """
+    model = _load(level_file, compact)
+    queries = _distance_queries(model, seed)
+
+    def run_distances(model: BreachModel) -> None:
+        for origin, destination in queries:
+            get_distance(model, origin, destination)
+
+    def run_movement(model: BreachModel) -> None:
+        for entity in model.get_entities():
+            model.get_valid_movement_positions(entity)
+
+    def setup_move_enemies() -> BreachModel:
+        model = _load(level_file, compact)
+        model.assign_objectives()
+        return model
+
+    def run_attacks(model: BreachModel) -> None:
+        for entity in model.get_entities():
+            if entity.is_alive():
+                model.make_attack(entity)
+
+    times = {
+        "read_file": _measure(lambda _: read_file(level_file)),
+        "get_distance": _measure(run_distances, lambda: model),
+        "get_valid_movement_positions": _measure(run_movement, lambda: model),
+        "move_enemies": _measure(
+            lambda model: model.move_enemies(), setup_move_enemies
+        ),
+        "make_attack": _measure(
+            run_attacks, lambda: _load(level_file, compact)
+        ),
+        "end_turn": _measure(
+            lambda model: model.end_turn(), lambda: _load(level_file, compact)
+        )
+    }
+    if combat.np is not None:
+        sequential = _load(level_file, compact)
+        sequential.end_turn()
+        vectorized = _load(level_file, compact)
+        vectorized.end_turn(vectorized=True)
+        if str(vectorized) != str(sequential):
+            raise RuntimeError(
+                f"{level_file}: the vectorized end_turn differs from the "
+                "sequential one"
+            )
+        times["end_turn_vectorized"] = _measure(
+            lambda model: model.end_turn(vectorized=True),
+            lambda: _load(level_file, compact)
+        )
+    if redraw is not None:
+        times["redraw"] = _measure(redraw, lambda: model)
+    return times
+
+
+def run_suite(
+    sizes: tuple[int, ...] = DEFAULT_SIZES,
+    densities: tuple[float, ...] = DEFAULT_DENSITIES,
+    compact: bool = False,
+    gui: bool = True,
+    seed: int = 0,
+    log: Callable[[str], None] = lambda message: None
+) -> dict:
+    """Benchmarks the bundled levels and a generated level for every size
+    and density.
+
+    Parameters:
+        sizes: The number of rows and columns of the generated levels.
+        densities: The fractions of cells holding entities.
+        compact: If True, boards are CompactBoards.
+        gui: If False, GameGrid.redraw is not timed.
+        seed: Seed for the generated levels and queries.
+        log: Called with a line of progress for each level.
+
+    Returns:
+        dict: The environment the suite ran in, and one result per level and
+              operation with the minimum and median time in seconds.
+    """
+    redraw = _open_grid() if gui else None
+    cases = [(os.path.basename(level), level, None) for level in LEVELS]
+    directory = tempfile.mkdtemp()
+    for size in sizes:
+        for density in densities:
+            level_file = os.path.join(directory, f"{size}-{density}.txt")
+            write_level(level_file, size, density, seed)
+            cases.append((f"generated-{size}-{density}", level_file, size))
+    level_file = os.path.join(directory, "kill-chain.txt")
+    write_kill_chain(level_file, KILL_CHAIN_LENGTH)
+    cases.append(("kill-chain", level_file, KILL_CHAIN_LENGTH))
+    results = []
+    try:
+        for case, level_file, size in cases:
+            start = time.perf_counter()
+            model = _load(level_file, compact)
+            times = benchmark_level(level_file, compact, redraw, seed)
+            for operation, runs in times.items():
+                results.append({
+                    "case": case,
+                    "dimensions": list(model.get_board().get_dimensions()),
+                    "entities": len(model.get_entities()),
+                    "operation": operation,
+                    "repeats": len(runs),
+                    "min": min(runs),
+                    "median": statistics.median(runs)
+                })
+            log(f"{case}: {time.perf_counter() - start:.1f}s")
+    finally:
+        for _, level_file, size in cases:
+            if size is not None:
+                os.remove(level_file)
+        os.rmdir(directory)
+
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "compact": compact,
+            "redraw": redraw is not None,
+            "seed": seed
+        },
+        "results": results
+    }
+
+
+def compare(
+    baseline: dict,
+    current: dict,
+    threshold: float = DEFAULT_THRESHOLD
+) -> list[dict]:
+    """Returns the change in the fastest time of every operation measured in
+    both <baseline> and <current>. The fastest run is compared because it is
+    the least affected by other load on the machine.
+
+    Parameters:
+        baseline: Results from run_suite to compare against.
+        current: Results from run_suite to compare.
+        threshold: The fractional slowdown above which an operation is
+                   flagged as a regression.
+
+    Returns:
+        list[dict]: The case, operation, both times, their ratio and
+                    whether it is a regression, in the order of <current>.
+    """
+    baseline_times = {
+        (result["case"], result["operation"]): result["min"]
+        for result in baseline["results"]
+    }
+    comparisons = []
+    for result in current["results"]:
+        key = (result["case"], result["operation"])
+        if key not in baseline_times:
+            continue
+        before = baseline_times[key]
+        ratio = result["min"] / before if before else float("inf")
+        comparisons.append({
+            "case": result["case"],
+            "operation": result["operation"],
+            "baseline": before,
+            "current": result["min"],
+            "ratio": ratio,
+            "regression": ratio > 1 + threshold
+        })
+    return comparisons
+
+
+def _report(comparisons: list[dict]) -> str:
+    """Returns a table of <comparisons> with regressions marked."""
+    lines = [
+        f"{'case':<24} {'operation':<30} {'baseline':>10} "
+        f"{'current':>10} {'ratio':>7}"
+    ]
+    for comparison in comparisons:
+        lines.append(
+            f"{comparison['case']:<24} {comparison['operation']:<30} "
+            f"{comparison['baseline'] * 1000:>8.2f}ms "
+            f"{comparison['current'] * 1000:>8.2f}ms "
+            f"{comparison['ratio']:>6.2f}x"
+            + ("  REGRESSION" if comparison["regression"] else "")
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Runs the benchmark suite from the command line."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the Into The Breach model's hot paths."
+    )
+    parser.add_argument("--output", help="file to write the results to")
+    parser.add_argument(
+        "--compare",
+        nargs="+",
+        metavar="FILE",
+        help="baseline results, and optionally results to compare with it "
+             "instead of running the suite"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="slowdown flagged as a regression (default: 0.2, i.e. 20%%)"
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument(
+        "--densities",
+        type=float,
+        nargs="+",
+        default=DEFAULT_DENSITIES
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--compact", action="store_true")
+    parser.add_argument(
+        "--no-gui",
+        action="store_true",
+        help="do not time GameGrid.redraw"
+    )
+    args = parser.parse_args(argv)
+
+    log = lambda message: sys.stderr.write(message + "\n")
+    if args.compare and len(args.compare) > 1:
+        with open(args.compare[1]) as file:
+            results = json.load(file)
+    else:
+        results = run_suite(
+            tuple(args.sizes),
+            tuple(args.densities),
+            args.compact,
+            not args.no_gui,
+            args.seed,
+            log
+        )
+        if args.output:
+            with open(args.output, "w") as file:
+                json.dump(results, file, indent=2)
+        elif not args.compare:
+            sys.stdout.write(json.dumps(results, indent=2) + "\n")
+
+    if args.compare:
+        with open(args.compare[0]) as file:
+            baseline = json.load(file)
+        comparisons = compare(baseline, results, args.threshold)
+        sys.stdout.write(_report(comparisons) + "\n")
+        if any(comparison["regression"] for comparison in comparisons):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
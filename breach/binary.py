@@ -0,0 +1,162 @@
+"""Versioned binary save format.
+
+A binary save holds the same game state as the text format written by
+str(BreachModel), laid out so that it can be restored without parsing each
+cell:
+
+    header     HEADER: magic, version, #rows, #columns, #entities
+    kinds      one byte per cell in row order (see SYMBOL_KINDS)
+    health     one byte per cell in row order (0 for non-buildings)
+    entities   one ENTITY_RECORD per entity, in descending priority order
+
+All integers are little-endian. Loading maps the file into memory and copies
+each section out whole, so the arrays go straight into a CompactBoard.
+Converting a text save to binary and back gives the same text. Binary saves
+also record whether each mech has moved this turn, which the text format does
+not.
+"""
+import mmap
+import struct
+
+from breach.constants import *
+from breach.board import Board, CompactBoard
+from breach.entities import Entity, Mech
+from breach.levels import ENTITY_TYPES
+from breach.model import BreachModel
+
+BINARY_EXTENSION = ".itb"
+MAGIC = b"ITBB"
+VERSION = 1
+# magic, version, rows, columns, entity count
+HEADER = struct.Struct("<4sHIII")
+# symbol, row, column, health, speed, strength, active
+ENTITY_RECORD = struct.Struct("<cIIiiiB")
+# Byte values that are valid tile kinds and building healths
+_KIND_CODES = bytes([BUILDING_KIND] + list(SYMBOL_KINDS.values()))
+_HEALTH_CODES = bytes(range(MAX_BUILDING_HEALTH + 1))
+# Translation table that turns every kind but a building into 0xFF and a
+# building into 0, so the bytes of non-building cells mask their health
+_HEALTH_MASK = bytes(
+    0 if code == BUILDING_KIND else 0xFF for code in range(256)
+)
+
+
+def write_binary(game_file: str, model: BreachModel) -> None:
+    """Writes the state of <model> to <game_file> in the binary format.
+
+    Parameters:
+        game_file: The file to write.
+        model: The game to save.
+    """
+    board = model.get_board()
+    if not isinstance(board, CompactBoard):
+        board = CompactBoard(str(board).split('\n'))
+    kinds, health = board.get_arrays()
+    rows, columns = board.get_dimensions()
+    entities = model.get_entities()
+
+    records = bytearray(ENTITY_RECORD.size * len(entities))
+    for index, entity in enumerate(entities):
+        symbol, row, column, hp, speed, strength = str(entity).split(',')
+        active = not isinstance(entity, Mech) or entity.is_active()
+        ENTITY_RECORD.pack_into(
+            records,
+            index * ENTITY_RECORD.size,
+            symbol.encode('ascii'),
+            int(row),
+            int(column),
+            int(hp),
+            int(speed),
+            int(strength),
+            active
+        )
+
+    with open(game_file, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, rows, columns, len(entities)))
+        file.write(kinds)
+        file.write(health)
+        file.write(records)
+
+
+def read_binary(
+    game_file: str
+) -> tuple[CompactBoard, list[Entity]]:
+    """Reads a binary save and returns its board and entities.
+
+    Parameters:
+        game_file: The file to be read.
+
+    Returns:
+        tuple[CompactBoard, list[Entity]]: The board, and the entities in
+                                           descending priority order.
+
+    Raises:
+        IOError: If the file cannot be opened.
+        ValueError: If the file is not a valid binary save of a supported
+                    version.
+    """
+    with open(game_file, 'rb') as file:
+        try:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise ValueError(f"{game_file} is empty")
+    with mapped:
+        if len(mapped) < HEADER.size:
+            raise ValueError(f"{game_file} is not a binary save")
+        magic, version, rows, columns, count = HEADER.unpack_from(mapped)
+        if magic != MAGIC:
+            raise ValueError(f"{game_file} is not a binary save")
+        if version != VERSION:
+            raise ValueError(
+                f"{game_file} has unsupported binary save version {version}"
+            )
+        cells = rows * columns
+        if len(mapped) != HEADER.size + 2 * cells + count * ENTITY_RECORD.size:
+            raise ValueError(f"{game_file} is truncated or corrupt")
+        # Slicing the map copies each section out in a single operation
+        start = HEADER.size
+        kinds = mapped[start:start + cells]
+        health = mapped[start + cells:start + 2 * cells]
+        records = mapped[start + 2 * cells:]
+
+    if (kinds.translate(None, _KIND_CODES)
+        or health.translate(None, _HEALTH_CODES)
+        ):
+        raise ValueError(f"{game_file} contains invalid tiles")
+    # Only buildings have health, which is checked for every cell at once by
+    # masking the health bytes with the kinds as two big integers
+    if (int.from_bytes(kinds.translate(_HEALTH_MASK), 'little')
+        & int.from_bytes(health, 'little')
+        ):
+        raise ValueError(f"{game_file} contains invalid tiles")
+    board = CompactBoard.from_arrays((rows, columns), kinds, health)
+    entities = []
+    for symbol, row, column, hp, speed, strength, active in (
+        ENTITY_RECORD.iter_unpack(records)
+    ):
+        entity_type = ENTITY_TYPES.get(symbol.decode('ascii', 'replace'))
+        if entity_type is None:
+            raise ValueError(f"{game_file} contains an unknown entity")
+        entity = entity_type((row, column), hp, speed, strength)
+        if not active and isinstance(entity, Mech):
+            entity.disable()
+        entities.append(entity)
+
+    return board, entities
+
+
+def load_binary(game_file: str, compact: bool = True) -> BreachModel:
+    """Returns a new game restored from a binary save.
+
+    Parameters:
+        game_file: The file to be read.
+        compact: If False, the board is converted to a Board.
+
+    Raises:
+        IOError: If the file cannot be opened.
+        ValueError: If the file is not a valid binary save.
+    """
+    board, entities = read_binary(game_file)
+    if not compact:
+        board = Board(str(board).split('\n'))
+    return BreachModel(board, entities)
@@ -0,0 +1,348 @@
+"""The game board."""
+import copy
+import hashlib
+
+from breach.constants import *
+from breach.tiles import Tile, Ground, Mountain, Building
+
+
+class Board():
+    """The class representing the game board."""
+
+    def __init__(self, board: list[list[str]]) -> None:
+        """Constructs a new board representing the state of <board>.
+
+        Parameters:
+            board: The board to be initialised.
+
+        Preconditions:
+            The length of every list within <board> is the same.
+            The length of <board> is >= 1.
+            The characters within the lists within <board> are all string
+            representations of one of the tile subclasses.
+        """
+        self._state = []
+        tiles = {'M': Mountain, ' ': Ground, 'T': Tile}
+        # Creates the game state using class instances
+        for row in board:
+            state_row = []
+            for tile in row:
+                if tile in ALLOWABLE_HEALTHS:
+                    state_row.append(Building(int(tile)))
+                else:
+                    state_row.append(tiles[tile]())
+            self._state.append(state_row)
+        # Whether this board may change its list of rows in place, and the
+        # rows and buildings it may change in place. None means every one of
+        # them; a fork starts with none of the three.
+        self._owns_state = True
+        self._owned_rows = None
+        self._owned_buildings = None
+        self._terrain_hash = None
+
+    def __repr__(self) -> str:
+        """Returns a string that could be used to construct an identical
+        board instance."""
+        board_list = [[str(tile) for tile in row] for row in self._state]
+        return f'{self.__class__.__name__}({board_list})'
+
+    def __str__(self) -> str:
+        """Returns a string representation of the board (the concatenation
+        of all the tile symbols in a row from left to right where each row is
+        represented on a new line)."""
+        rows = [''.join([str(tile) for tile in row]) for row in self._state]
+        return '\n'.join(rows)
+
+    def get_dimensions(self) -> tuple[int, int]:
+        """Returns the dimensions of the board in terms of number of tiles."""
+        return len(self._state), len(self._state[0])
+
+    def get_tile(self, position: tuple[int, int]) -> Tile:
+        """Returns the tile at the given position on the board.
+
+        Parameters:
+            position: The location of the tile.
+
+        Returns:
+            The tile instance at the the given position.
+
+        Preconditions:
+            <position> is within the bounds of the board.
+        """
+        return self._state[position[0]][position[1]]
+    
+    def get_buildings(self) -> dict[tuple[int, int], Building]:
+        """Returns a dictionary of the position of every building mapped
+        to the building instance itself."""
+        buildings = {
+            (i, j): self.get_tile((i, j))
+            for i in range(self.get_dimensions()[0])
+            for j in range(self.get_dimensions()[1])
+            if type(self.get_tile((i, j))) == Building
+        }
+        return buildings
+
+    def terrain_hash(self) -> int:
+        """Returns a 64-bit digest of the board's dimensions and the kind of
+        every tile, in which every building counts the same whatever its
+        health. Terrain never changes, so the digest is computed once and
+        kept by forks made after that. Boards and compact boards of the same
+        layout have the same digest."""
+        if self._terrain_hash is None:
+            self._terrain_hash = _digest(
+                self.get_dimensions(),
+                str(self).replace('\n', '').encode('ascii').translate(
+                    CompactBoard._KIND_TABLE
+                )
+            )
+        return self._terrain_hash
+
+    def fork(self) -> "Board":
+        """Returns a copy of this board that shares its list of rows, and
+        every row and tile, with it. Terrain never changes, and the list, a
+        row and a building are only copied when one of the boards first
+        damages a building in them (see own_building), so forking takes
+        constant time."""
+        fork = copy.copy(self)
+        for board in (self, fork):
+            board._owns_state = False
+            board._owned_rows = set()
+            board._owned_buildings = set()
+        return fork
+
+    def own_building(self, position: tuple[int, int]) -> Building:
+        """Returns the building at <position>, first replacing it with a copy
+        if it is shared with a fork of this board. Buildings must be fetched
+        with this method before they are changed.
+
+        Parameters:
+            position: The location of the building.
+
+        Preconditions:
+            There is a building at <position>.
+        """
+        row, column = position
+        if self._owned_buildings is None or position in self._owned_buildings:
+            return self._state[row][column]
+        if not self._owns_state:
+            self._state = list(self._state)
+            self._owns_state = True
+        if row not in self._owned_rows:
+            self._state[row] = list(self._state[row])
+            self._owned_rows.add(row)
+        building = self._state[row][column] = copy.copy(
+            self._state[row][column]
+        )
+        self._owned_buildings.add(position)
+        return building
+
+
+def _digest(dimensions: tuple[int, int], kinds: bytes) -> int:
+    """Returns a 64-bit digest of a board with the given dimensions and tile
+    kind array."""
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(f"{dimensions[0]},{dimensions[1]}:".encode('ascii'))
+    digest.update(kinds)
+    return int.from_bytes(digest.digest(), 'little')
+
+
+class _BuildingView(Building):
+    """A building whose health lives in the health array of a CompactBoard.
+    Behaves exactly like a Building, and damage is written straight back to
+    the array. A view stays with the array it was made for, so when a board
+    copies its array it makes new views."""
+
+    def __init__(self, cells: bytearray, index: int) -> None:
+        """Constructs a view of the building at <index> in <cells>.
+
+        Parameters:
+            cells: The health array of the board that stores the building.
+            index: The flat (row * columns + column) index of the building.
+        """
+        self._name = BUILDING_NAME
+        self._cells = cells
+        self._index = index
+
+    @property
+    def _health(self) -> int:
+        return self._cells[self._index]
+
+    @_health.setter
+    def _health(self, health: int) -> None:
+        # Building.damage assigns before clamping, so clamp here to keep the
+        # value storable in a byte
+        self._cells[self._index] = min(
+            max(health, 0),
+            MAX_BUILDING_HEALTH
+        )
+
+
+class CompactBoard(Board):
+    """A board that stores tile kinds and building health in flat byte
+    arrays instead of one tile object per cell. Intended for very large
+    boards; it can be used anywhere a Board is expected."""
+
+    # Immutable tiles are shared between every cell of the same kind
+    _SHARED_TILES = {
+        GROUND_KIND: Ground(),
+        MOUNTAIN_KIND: Mountain(),
+        TILE_KIND: Tile()
+    }
+    # bytes.translate tables from tile symbols to kinds and health, and from
+    # kind + health back to the tile symbol
+    _KIND_TABLE = bytes(
+        SYMBOL_KINDS.get(chr(byte), BUILDING_KIND) for byte in range(256)
+    )
+    _HEALTH_TABLE = bytes(
+        int(chr(byte)) if chr(byte) in ALLOWABLE_HEALTHS else 0
+        for byte in range(256)
+    )
+    _SYMBOL_TABLE = bytes(
+        ord(symbol) for symbol in ALLOWABLE_HEALTHS + list(SYMBOL_KINDS)
+    ).ljust(256, b'?')
+
+    def __init__(self, board: list[list[str]]) -> None:
+        """Constructs a new compact board representing the state of <board>.
+
+        Parameters:
+            board: The board to be initialised, as a list of rows where each
+                   row is a string or a list of tile symbols.
+
+        Preconditions:
+            As for Board.
+        """
+        rows = [''.join(row) for row in board]
+        cells = ''.join(rows).encode('ascii')
+        self._dimensions = (len(rows), len(rows[0]))
+        self._kinds = bytearray(cells.translate(self._KIND_TABLE))
+        self._health = bytearray(cells.translate(self._HEALTH_TABLE))
+        # False while the health array is shared with a fork
+        self._owns_health = True
+        self._views = {}
+        self._terrain_hash = None
+
+    @classmethod
+    def from_arrays(
+        cls,
+        dimensions: tuple[int, int],
+        kinds: bytes,
+        health: bytes
+    ) -> "CompactBoard":
+        """Returns a board built straight from tile kind and building health
+        arrays, such as those returned by get_arrays.
+
+        Parameters:
+            dimensions: The (#rows, #columns) of the board.
+            kinds: The kind code of every cell, in row order.
+            health: The health of every cell (0 for non-buildings).
+
+        Preconditions:
+            Both arrays hold exactly #rows * #columns valid values.
+        """
+        board = cls.__new__(cls)
+        board._dimensions = dimensions
+        board._kinds = bytearray(kinds)
+        board._health = bytearray(health)
+        board._owns_health = True
+        board._views = {}
+        board._terrain_hash = None
+        return board
+
+    def get_arrays(self) -> tuple[bytearray, bytearray]:
+        """Returns the board's tile kind and building health arrays, one byte
+        per cell in row order. The arrays belong to the board and must not be
+        modified by the caller."""
+        return self._kinds, self._health
+
+    def __repr__(self) -> str:
+        """Returns a string that could be used to construct an identical
+        board instance."""
+        board_list = [list(row) for row in str(self).split('\n')]
+        return f'{self.__class__.__name__}({board_list})'
+
+    def __str__(self) -> str:
+        """Returns a string representation of the board, identical to that of
+        a Board with the same tiles."""
+        # Every byte of kinds + health is at most TILE_KIND, so adding the
+        # arrays as big integers never carries between cells
+        length = len(self._kinds)
+        codes = (
+            int.from_bytes(self._kinds, 'big')
+            + int.from_bytes(self._health, 'big')
+        ).to_bytes(length, 'big')
+        text = codes.translate(self._SYMBOL_TABLE).decode('ascii')
+        columns = self._dimensions[1]
+        return '\n'.join(
+            text[start:start + columns] for start in range(0, length, columns)
+        )
+
+    def get_dimensions(self) -> tuple[int, int]:
+        """Returns the dimensions of the board in terms of number of tiles."""
+        return self._dimensions
+
+    def get_tile(self, position: tuple[int, int]) -> Tile:
+        """Returns the tile at the given position on the board. Buildings are
+        returned as views that read and write the board's health array.
+
+        Parameters:
+            position: The location of the tile.
+
+        Returns:
+            The tile instance at the the given position.
+
+        Preconditions:
+            <position> is within the bounds of the board.
+        """
+        index = position[0] * self._dimensions[1] + position[1]
+        kind = self._kinds[index]
+        if kind != BUILDING_KIND:
+            return self._SHARED_TILES[kind]
+        view = self._views.get(index)
+        if view is None:
+            view = self._views[index] = _BuildingView(self._health, index)
+        return view
+
+    def get_buildings(self) -> dict[tuple[int, int], Building]:
+        """Returns a dictionary of the position of every building mapped
+        to the building instance itself."""
+        columns = self._dimensions[1]
+        buildings = {}
+        index = self._kinds.find(BUILDING_KIND)
+        while index != -1:
+            position = divmod(index, columns)
+            buildings[position] = self.get_tile(position)
+            index = self._kinds.find(BUILDING_KIND, index + 1)
+        return buildings
+
+    def terrain_hash(self) -> int:
+        """Returns a 64-bit digest of the board's dimensions and tile kinds.
+        See Board.terrain_hash."""
+        if self._terrain_hash is None:
+            self._terrain_hash = _digest(self._dimensions, self._kinds)
+        return self._terrain_hash
+
+    def fork(self) -> "CompactBoard":
+        """Returns a copy of this board that shares its tile kinds with it
+        for good, and its building health and building views until either
+        board damages a building (see own_building)."""
+        fork = copy.copy(self)
+        self._owns_health = fork._owns_health = False
+        return fork
+
+    def own_building(self, position: tuple[int, int]) -> Building:
+        """Returns the building at <position>, first copying the health array
+        if it is shared with a fork of this board. Buildings must be fetched
+        with this method before they are changed.
+
+        Parameters:
+            position: The location of the building.
+
+        Preconditions:
+            There is a building at <position>.
+        """
+        if not self._owns_health:
+            self._health = bytearray(self._health)
+            self._owns_health = True
+            # The old views belong to the array the other board keeps
+            self._views = {}
+        return self.get_tile(position)
@@ -0,0 +1,27 @@
+"""Command line tool that builds a level pack (see breach.pack), for example:
+
+    python -m breach.build_pack campaign.itbp levels/*.txt
+
+It lives apart from breach.pack because the breach package imports that
+module, and running a module that is already imported makes Python warn.
+"""
+import argparse
+from typing import Optional
+
+from breach.pack import write_pack
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Builds a level pack from the command line."""
+    parser = argparse.ArgumentParser(
+        description="Bundle Into The Breach level files into a level pack."
+    )
+    parser.add_argument("pack", help="pack file to write")
+    parser.add_argument("levels", nargs="+", help="level files to include")
+    args = parser.parse_args(argv)
+    count = write_pack(args.pack, args.levels)
+    print(f"Wrote {count} levels to {args.pack}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,391 @@
+"""Vectorized resolution of the attack phase of Into The Breach.
+
+The attack phase in BreachModel.end_turn makes every living entity attack in
+descending priority order, one at a time. compute_attack_damage works out
+exactly the same outcome using NumPy array operations over a struct-of-arrays
+table of the entities and buildings (a CombatTable), for boards with thousands
+of entities. A game keeps its table up to date from turn to turn, so it is
+only built once. BreachModel.make_attack remains the reference
+implementation.
+
+NumPy is optional and only required when compute_attack_damage is called.
+"""
+from typing import Optional
+
+from breach.constants import HEAL_NAME, MAX_BUILDING_HEALTH
+
+try:
+    import numpy as np
+except ImportError:  # Only needed for vectorized combat
+    np = None
+
+
+def _group_starts(keys: "np.ndarray") -> "np.ndarray":
+    """Returns a boolean mask marking the first element of each run of equal
+    values in <keys>."""
+    starts = np.ones(len(keys), dtype=bool)
+    starts[1:] = keys[1:] != keys[:-1]
+    return starts
+
+
+def _grouped_cumsum(keys: "np.ndarray", values: "np.ndarray") -> "np.ndarray":
+    """Returns the running total of <values> restarting at every new run of
+    equal <keys>.
+
+    Parameters:
+        keys: Group keys, with equal keys next to each other.
+        values: The values to total.
+    """
+    starts = _group_starts(keys)
+    totals = np.cumsum(values)
+    before_group = (totals - values)[starts]
+    return totals - before_group[np.cumsum(starts) - 1]
+
+
+def _resolve_entity_damage(
+    health: "np.ndarray",
+    targets: "np.ndarray",
+    damage: "np.ndarray"
+) -> "np.ndarray":
+    """Applies attack events to entity health in attacker order.
+
+    An entity's health simply moves by each damage or heal until it first
+    reaches 0, after which it stays at 0, so the outcome only depends on the
+    running total of the events against it.
+
+    Parameters:
+        health: Health of every entity before the attack phase.
+        targets: The target entity index of each event.
+        damage: The damage (negative to heal) of each event.
+
+    Preconditions:
+        The events are sorted by target, then attacker, and are only against
+        entities that are alive.
+
+    Returns:
+        The health of every entity after the events.
+    """
+    final_health = health.copy()
+    if len(targets) == 0:
+        return final_health
+
+    remaining = health[targets] - _grouped_cumsum(targets, damage)
+
+    # Everyone left standing takes the total of the events against them
+    last = np.flatnonzero(np.append(_group_starts(targets)[1:], True))
+    final_health[targets[last]] = remaining[last]
+
+    # The first event that takes an entity to 0 kills it for good
+    lethal = np.flatnonzero(remaining <= 0)
+    first = lethal[_group_starts(targets[lethal])]
+    final_health[targets[first]] = 0
+    return final_health
+
+
+def _resolve_building_damage(
+    health: "np.ndarray",
+    attackers: "np.ndarray",
+    targets: "np.ndarray",
+    damage: "np.ndarray"
+) -> "np.ndarray":
+    """Applies attack events to building health in attacker order, following
+    Building.damage.
+
+    Parameters:
+        health: Health of every building before the attack phase.
+        attackers: The attacker index of each event.
+        targets: The target building index of each event.
+        damage: The damage (negative to repair) of each event.
+
+    Returns:
+        The health of every building after the events.
+    """
+    final_health = health.copy()
+    live = health[targets] > 0
+    attackers, targets, damage = attackers[live], targets[live], damage[live]
+    if len(targets) == 0:
+        return final_health
+
+    order = np.lexsort((attackers, targets))
+    targets, damage = targets[order], damage[order]
+    starts = np.flatnonzero(_group_starts(targets))
+    ends = np.append(starts[1:], len(targets))
+
+    # Without repairs, health only falls, so only the clamp at 0 matters
+    has_repair = np.logical_or.reduceat(damage < 0, starts)
+    totals = np.add.reduceat(damage, starts)
+    simple = ~has_repair
+    group_targets = targets[starts]
+    final_health[group_targets[simple]] = np.maximum(
+        health[group_targets[simple]] - totals[simple],
+        0
+    )
+
+    # Repairs can hit the MAX_BUILDING_HEALTH clamp, so those few buildings
+    # are replayed one event at a time
+    for group in np.flatnonzero(has_repair):
+        building = group_targets[group]
+        building_health = int(health[building])
+        for event_damage in damage[starts[group]:ends[group]].tolist():
+            if building_health:
+                building_health = min(
+                    max(building_health - event_damage, 0),
+                    MAX_BUILDING_HEALTH
+                )
+        final_health[building] = building_health
+    return final_health
+
+
+class CombatTable():
+    """A struct-of-arrays copy of the entities and buildings of a game. Each
+    entity has a row in the game's entity order, and each building a row in
+    the order of its position. A game that resolves its attack phase with
+    compute_attack_damage keeps its table up to date as entities move,
+    entities and buildings change health, and entities are removed, so the
+    table only has to be built once."""
+
+    def __init__(self, model: "BreachModel") -> None:
+        """Builds the table of the entities and buildings in <model>.
+
+        Parameters:
+            model: The game to build the table of.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        if np is None:
+            raise ImportError("Vectorized combat requires NumPy")
+        rows, columns = model.get_board().get_dimensions()
+        self.dimensions = (rows, columns)
+        self.cell_count = rows * columns
+        entities = model.get_entities()
+        # Each entity type, and the attack offsets of each
+        self.types = []
+        self.offsets = []
+        type_indices = {}
+        for entity in entities:
+            if type(entity) not in type_indices:
+                type_indices[type(entity)] = len(self.types)
+                self.types.append(type(entity))
+                self.offsets.append(np.array(
+                    model.get_attack_offsets(entity),
+                    dtype=np.int64
+                ).reshape(-1, 2))
+        table = np.array(
+            [
+                (
+                    entity.get_health(),
+                    *entity.get_position(),
+                    entity.get_strength(),
+                    entity.is_friendly(),
+                    entity.get_name() == HEAL_NAME,
+                    type_indices[type(entity)]
+                )
+                for entity in entities
+            ],
+            dtype=np.int64
+        ).reshape(-1, 7)
+        self.health, self.rows, self.columns, self.strength = (
+            column.copy() for column in table[:, :4].T
+        )
+        self.friendly, self.heals = table[:, 4:6].T.astype(bool)
+        self.kinds = table[:, 6].copy()
+
+        # Buildings never move, so the building on each cell is found with
+        # one lookup in a board-sized array
+        buildings = model.get_buildings()
+        self.building_positions = sorted(buildings)
+        self.building_indices = {
+            position: index
+            for index, position in enumerate(self.building_positions)
+        }
+        self.building_health = np.array(
+            [
+                int(str(buildings[position]))
+                for position in self.building_positions
+            ],
+            dtype=np.int64
+        )
+        self.building_at = np.full(self.cell_count, -1, dtype=np.int64)
+        self.building_at[[
+            row * columns + column
+            for row, column in self.building_positions
+        ]] = np.arange(len(self.building_positions))
+
+    def set_health(self, index: int, health: int) -> None:
+        """Records the health of the entity in row <index>."""
+        self.health[index] = health
+
+    def set_position(self, index: int, position: tuple[int, int]) -> None:
+        """Records the (row, column) position of the entity in row
+        <index>."""
+        self.rows[index], self.columns[index] = position
+
+    def set_building_health(
+        self,
+        position: tuple[int, int],
+        health: int
+    ) -> None:
+        """Records the health of the building at <position>."""
+        self.building_health[self.building_indices[position]] = health
+
+    def keep(self, survivors: list[bool]) -> None:
+        """Removes the rows of the entities that are not marked in
+        <survivors>, keeping the rest in order."""
+        mask = np.array(survivors, dtype=bool)
+        self.health = self.health[mask]
+        self.rows = self.rows[mask]
+        self.columns = self.columns[mask]
+        self.strength = self.strength[mask]
+        self.friendly = self.friendly[mask]
+        self.heals = self.heals[mask]
+        self.kinds = self.kinds[mask]
+
+
+def compute_attack_damage(
+    model: "BreachModel",
+    table: Optional[CombatTable] = None
+) -> tuple[list[tuple["Entity", int]], list[tuple[tuple[int, int], int]]]:
+    """Works out the outcome of the attack phase of <model> with array
+    operations, without changing the model. The outcome is identical to each
+    living entity calling model.make_attack in descending priority order,
+    including entities that die part way through the phase not attacking.
+
+    Parameters:
+        model: The game to compute the attack phase of.
+        table: An up to date table of <model>. If not given, one is built.
+
+    Returns:
+        The net damage taken by each entity whose health changes, as
+        (entity, damage) pairs in descending priority order, and by each
+        building whose health changes, as (position, damage) pairs. Applying
+        these with Entity.damage and Building.damage gives the final health.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+    """
+    if np is None:
+        raise ImportError("Vectorized combat requires NumPy")
+
+    entities = model.get_entities()
+    count = len(entities)
+    if count == 0:
+        return [], []
+    if table is None:
+        table = CombatTable(model)
+    rows_count, columns = table.dimensions
+    health, rows, cols = table.health, table.rows, table.columns
+    strength, friendly, heals = table.strength, table.friendly, table.heals
+
+    # The entity on each cell, or -1. Positions are unique, as in the
+    # model's position index.
+    entity_at = np.full(table.cell_count, -1, dtype=np.int64)
+    entity_at[rows * columns + cols] = np.arange(count)
+
+    # Every (attacker, target cell) pair, grouped by entity type
+    attacker_parts = []
+    cell_parts = []
+    kind_order = np.argsort(table.kinds, kind='stable')
+    kind_starts = np.searchsorted(
+        table.kinds[kind_order],
+        np.arange(len(table.types) + 1)
+    )
+    for kind, offsets in enumerate(table.offsets):
+        indices = kind_order[kind_starts[kind]:kind_starts[kind + 1]]
+        target_rows = rows[indices, None] + offsets[None, :, 0]
+        target_cols = cols[indices, None] + offsets[None, :, 1]
+        in_bounds = (
+            (0 <= target_rows) & (target_rows < rows_count)
+            & (0 <= target_cols) & (target_cols < columns)
+        )
+        attacker_parts.append(
+            np.broadcast_to(indices[:, None], in_bounds.shape)[in_bounds]
+        )
+        cell_parts.append((target_rows * columns + target_cols)[in_bounds])
+    event_attackers = np.concatenate(attacker_parts)
+    event_cells = np.concatenate(cell_parts)
+
+    # Attacks against living entities, sorted by target then attacker. Heal
+    # mechs only affect friendly entities.
+    hit = entity_at[event_cells]
+    hits_entity = hit >= 0
+    entity_attackers = event_attackers[hits_entity]
+    entity_targets = hit[hits_entity]
+    keep = (
+        (~heals[entity_attackers] | friendly[entity_targets])
+        & (health[entity_targets] > 0)
+    )
+    entity_attackers = entity_attackers[keep]
+    entity_targets = entity_targets[keep]
+    order = np.lexsort((entity_attackers, entity_targets))
+    entity_attackers = entity_attackers[order]
+    entity_targets = entity_targets[order]
+    entity_damage = strength[entity_attackers]
+
+    # Whether an entity gets to attack only depends on the attacks made
+    # before its turn, by entities whose own attacks are already settled.
+    # Entities that the earlier damage could not kill even if none of it
+    # were healed always attack, so only the others are walked through, in
+    # priority order, each one settling before any entity it could affect.
+    alive = health > 0
+    attacking = alive.copy()
+    earlier = (entity_attackers < entity_targets) & (entity_damage > 0)
+    worst_damage = np.bincount(
+        entity_targets[earlier],
+        weights=entity_damage[earlier],
+        minlength=count
+    )
+    at_risk = np.flatnonzero(alive & (worst_damage >= health))
+    if len(at_risk):
+        # Each event of an entity at risk is looked at once at most
+        starts = np.searchsorted(entity_targets, at_risk).tolist()
+        ends = np.searchsorted(entity_targets, at_risk, side='right').tolist()
+        attackers = entity_attackers.tolist()
+        damages = entity_damage.tolist()
+        healths = health.tolist()
+        attacks = attacking.tolist()
+        for target, start, end in zip(at_risk.tolist(), starts, ends):
+            target_health = healths[target]
+            for event in range(start, end):
+                attacker = attackers[event]
+                if attacker >= target:
+                    break
+                if attacks[attacker]:
+                    target_health -= damages[event]
+                    if target_health <= 0:
+                        attacks[target] = False
+                        break
+        attacking = np.array(attacks, dtype=bool)
+    final_health = _resolve_entity_damage(
+        health,
+        entity_targets,
+        np.where(attacking[entity_attackers], entity_damage, 0)
+    )
+
+    # Attacks against buildings by the entities that attacked
+    hit = table.building_at[event_cells]
+    hits_building = (hit >= 0) & attacking[event_attackers]
+    building_attackers = event_attackers[hits_building]
+    building_health = table.building_health
+    final_building_health = _resolve_building_damage(
+        building_health,
+        building_attackers,
+        hit[hits_building],
+        strength[building_attackers]
+    )
+
+    changed = np.flatnonzero(final_health != health)
+    entity_damage = [
+        (entities[index], damage)
+        for index, damage in zip(
+            changed.tolist(),
+            (health[changed] - final_health[changed]).tolist()
+        )
+    ]
+    changed = np.flatnonzero(final_building_health != building_health)
+    damage = building_health[changed] - final_building_health[changed]
+    building_damage = [
+        (table.building_positions[index], damage)
+        for index, damage in zip(changed.tolist(), damage.tolist())
+    ]
+    return entity_damage, building_damage
@@ -0,0 +1,56 @@
+"""Constants shared by the Into The Breach model and view."""
+
+# Model Constants
+TANK_RANGE = 5
+SCORPION_RANGE = 2
+FIREFLY_RANGE = 5
+
+MAX_BUILDING_HEALTH = 9
+
+TILE_NAME = "Tile"
+TILE_SYMBOL = "T"
+GROUND_NAME = "Ground"
+GROUND_SYMBOL = " "
+MOUNTAIN_NAME = "Mountain"
+MOUNTAIN_SYMBOL = "M"
+BUILDING_NAME = "Building"
+
+ENTITY_NAME = "Entity"
+ENTITY_SYMBOL = "E"
+MECH_NAME = "Mech"
+MECH_SYMBOL = "M"
+ENEMY_NAME = "Enemy"
+ENEMY_SYMBOL = "N"
+TANK_NAME = "TankMech"
+TANK_SYMBOL = "T"
+HEAL_NAME = "HealMech"
+HEAL_SYMBOL = "H"
+SCORPION_NAME = "Scorpion"
+SCORPION_SYMBOL = "S"
+FIREFLY_NAME = "Firefly"
+FIREFLY_SYMBOL = "F"
+
+TANK_DISPLAY = "\U000023F8"
+HEAL_DISPLAY = "\U0001F6E1"
+SCORPION_DISPLAY = "\U00010426"
+FIREFLY_DISPLAY = "\U00000D9E"
+
+# Used to get attack tiles for various entities
+PLUS_OFFSETS = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+
+ALLOWABLE_HEALTHS = [str(x) for x in range(0, MAX_BUILDING_HEALTH + 1)]
+MECH_NAMES = (TANK_NAME, HEAL_NAME)
+ENEMY_NAMES = (FIREFLY_NAME, SCORPION_NAME)
+
+# Tile kind codes used by CompactBoard. Buildings are kind 0 and the others
+# start above MAX_BUILDING_HEALTH, so kind + health is a distinct code for
+# every tile symbol.
+BUILDING_KIND = 0
+GROUND_KIND = MAX_BUILDING_HEALTH + 1
+MOUNTAIN_KIND = MAX_BUILDING_HEALTH + 2
+TILE_KIND = MAX_BUILDING_HEALTH + 3
+SYMBOL_KINDS = {
+    GROUND_SYMBOL: GROUND_KIND,
+    MOUNTAIN_SYMBOL: MOUNTAIN_KIND,
+    TILE_SYMBOL: TILE_KIND
+}
@@ -0,0 +1,374 @@
+"""The mechs and enemies that take part in the game."""
+from breach.constants import *
+from breach.tiles import Building
+
+
+class Entity():
+    """The abstract class for entites."""
+    
+    def __init__(
+        self,
+        position: tuple[int, int],
+        initial_health: int,
+        speed: int,
+        strength: int
+    ) -> None:
+        """Constructs a new entity with the specified position, health,
+        speed and strength.
+
+        Parameters:
+            position: The position of the entity.
+            initial_health: The starting health of the entity.
+            speed: The max distance the entity can travel in a single move.
+            strength: The strength of the entity's attacks.
+        """
+        self._name = ENTITY_NAME
+        self._symbol = ENTITY_SYMBOL
+        self._position = position
+        self._health = initial_health
+        self._speed = speed
+        self._strength = strength
+        self._is_friendly = False
+
+    def __repr__(self) -> str:
+        """Returns the representation of the entity that can be used to create
+        another identical instance."""
+        return '{0}({1}, {2}, {3}, {4})'.format(
+            self._name,
+            self._position,
+            self._health,
+            self._speed,
+            self._strength
+        )
+
+    def __str__(self) -> str:
+        """Returns the string representation of the entity."""
+        return '{0},{1},{2},{3},{4},{5}'.format(
+            self._symbol,
+            self._position[0],
+            self._position[1],
+            self._health,
+            self._speed,
+            self._strength
+        )
+            
+    def get_symbol(self) -> str:
+        """Returns the character that represents the entity type."""
+        return self._symbol
+
+    def get_name(self) -> str:
+        """Returns the name of the entity type."""
+        return self._name
+
+    def get_position(self) -> tuple[int, int]:
+        """Returns the current position, (row, column), of the entity."""
+        return self._position
+
+    def set_position(self, position: tuple[int, int]) -> None:
+        """Moves the entity to the given position.
+
+        Parameters:
+            position: The (row, column) position to move the entity to.
+        """
+        self._position = position
+
+    def get_health(self) -> int:
+        """Returns the current health of the entity."""
+        return self._health
+
+    def get_speed(self) -> int:
+        """Returns the speed of the entity."""
+        return self._speed
+
+    def get_strength(self) -> int:
+        """Returns the strength of the entity."""
+        return self._strength
+
+    def damage(self, damage: int) -> None:
+        """Reduces the health of the entity by <damage> if the entity is not
+        destroyed.
+
+        Parameters:
+            damage: The amount of health the entity should lose.
+        """
+        if self._health:
+            self._health -= damage
+        # Constrains health to a non-negative value
+        if self._health < 0:
+            self._health = 0
+
+    def is_alive(self) -> bool:
+        """Returns a boolean corresponding to whether the entity is still       
+        alive."""
+        return self._health > 0
+    
+    def is_friendly(self) -> bool:
+        """Returns whether or not the entity is friendly."""
+        return self._is_friendly
+
+    def get_targets(self) -> list[tuple[int, int]]:
+        """Returns the (row, column) positions that would be attacked by the
+        entity during the combat phase."""
+        position = self._position
+        targets = [
+            (position[0] + offset[0], position[1] + offset[1])
+            for offset in PLUS_OFFSETS
+        ]
+        return targets
+
+    def attack(self, entity: "Entity") -> None:
+        """Damages the selected entity by the amount specified by the
+        attacking entity's strength.
+
+        Parameters:
+            entity: The entity that should be damaged.
+        """
+        entity.damage(self._strength)
+
+
+class Mech(Entity):
+    """The abstract class for mech entities."""
+    
+    def __init__(
+        self,
+        position: tuple[int, int],
+        initial_health: int,
+        speed: int,
+        strength: int
+    ) -> None:
+        super().__init__(position, initial_health, speed, strength)
+        self._previous_position = None
+        self._symbol = MECH_SYMBOL
+        self._name = MECH_NAME
+        self._active = True
+        self._is_friendly = True
+
+    def set_position(self, position: tuple[int, int]) -> None:
+        """Moves the mech to the given position and updates its previous
+        position.
+
+        Parameters:
+            position: The (row, column) position to move the mech to.
+        """
+        self._previous_position = self._position
+        self._position = position
+
+    def enable(self) -> None:
+        """Sets the mech to active."""
+        self._active = True
+        
+    def disable(self) -> None:
+        """Sets the mech to inactive."""
+        self._active = False
+
+    def is_active(self) -> bool:
+        """Returns a boolean corresponding to whether the mech is active."""
+        return self._active
+
+
+class TankMech(Mech):
+    """The class for tank mechs."""
+    
+    def __init__(
+        self,
+        position: tuple[int, int],
+        initial_health: int,
+        speed: int,
+        strength: int
+    ) -> None:
+        super().__init__(position, initial_health, speed, strength)
+        self._symbol = TANK_SYMBOL
+        self._name = TANK_NAME
+
+    def get_targets(self) -> list[tuple[int, int]]:
+        """Returns the (row, column) positions that would be attacked by the
+        tank mech during the combat phase."""
+        position = self.get_position()
+        targets = [
+            (position[0] + i*offset[0], position[1] + i*offset[1])
+            for i in range(1, TANK_RANGE + 1)
+            for offset in PLUS_OFFSETS[:2]
+        ]
+        return targets
+            
+
+class HealMech(Mech):
+    """The class for heal mechs."""
+    
+    def __init__(
+        self,
+        position: tuple[int, int],
+        initial_health: int,
+        speed: int,
+        strength: int
+    ) -> None:
+        super().__init__(position, initial_health, speed, strength)
+        self._symbol = HEAL_SYMBOL
+        self._name = HEAL_NAME
+
+    def get_strength(self) -> int:
+        """Returns the negative of the strength of the heal mech."""
+        return -self._strength
+
+    def attack(self, entity: "Entity") -> None:
+        """Heals <entity> by the strength of the heal mech dealing the
+        attack if an only if <entity> is friendly.
+
+        Parameters:
+            entity: The entity to be healed.
+        """
+        if entity.is_friendly():
+            entity.damage(-self._strength)
+
+
+class Enemy(Entity):
+    """The abstract class for enemies."""
+
+    def __init__(
+        self,
+        position: tuple[int, int],
+        initial_health: int,
+        speed: int,
+        strength: int
+    ) -> None:
+        super().__init__(position, initial_health, speed, strength)
+        self._name = ENEMY_NAME
+        self._symbol = ENEMY_SYMBOL
+        self._objective = position
+
+    def get_objective(self) -> tuple[int, int]:
+        """Returns the position which is the enemy's objective position."""
+        return self._objective
+
+    def update_objective(
+        self,
+        entities: list[Entity],
+        buildings: dict[tuple[int, int], Building]
+    ) -> None:
+        """Updates the objective position of the enemy.
+
+        Parameters:
+            entities: The list of entities in the game currently.
+            buildings: A dictionary mapping the position of buildings to the
+                       buildings themselves.
+
+        Preconditions:
+            <entities> is sorted in descending priority order.
+        """
+        self._objective = self._position
+
+
+class Scorpion(Enemy):
+    def __init__(
+        self,
+        position: tuple[int, int],
+        initial_health: int,
+        speed: int,
+        strength: int
+    ) -> None:
+        super().__init__(position, initial_health, speed, strength)
+        self._name = SCORPION_NAME
+        self._symbol = SCORPION_SYMBOL
+
+    def get_targets(self) -> list[tuple[int, int]]:
+        """Returns the (row, column) positions that would be attacked by the
+        scorpion during the combat phase."""
+        position = self.get_position()
+        targets = [
+            (position[0] + i*offset[0], position[1] + i*offset[1])
+            for i in range(1, SCORPION_RANGE + 1)
+            for offset in PLUS_OFFSETS
+        ]
+        return targets
+
+    def update_objective(
+        self,
+        entities: list[Entity],
+        buildings: dict[tuple[int, int], Building]
+    ) -> None:
+        """Updates the objective position of the scorpion.
+
+        Parameters:
+            entities: The list of entities in the game currently.
+            buildings: A dictionary mapping the position of buildings to the
+                       buildings themselves.
+
+        Preconditions:
+            <entities> is sorted in descending priority order.
+        """
+        greatest_health_mech = None
+        greatest_health = 0
+        
+        for entity in entities:
+            if (entity.get_name() in MECH_NAMES
+                and entity.get_health() > greatest_health
+                ):
+                greatest_health_mech = entity
+                greatest_health = entity.get_health()
+
+        if greatest_health_mech:
+            self._objective = greatest_health_mech.get_position()
+        else:
+            self._objective = self.get_position()
+        
+
+class Firefly(Enemy):
+    def __init__(
+        self,
+        position: tuple[int, int],
+        initial_health: int,
+        speed: int,
+        strength: int
+    ) -> None:
+        super().__init__(position, initial_health, speed, strength)
+        self._name = FIREFLY_NAME
+        self._symbol = FIREFLY_SYMBOL
+
+    def get_targets(self) -> list[tuple[int, int]]:
+        """Returns a list of the positions which are targets for the
+        firefly."""
+        position = self.get_position()
+        targets = [
+            (position[0] + i*offset[0], position[1] + i*offset[1])
+            for i in range(1, FIREFLY_RANGE + 1)
+            for offset in PLUS_OFFSETS[2:]
+        ]
+        return targets
+
+    def update_objective(
+        self,
+        entities: list[Entity],
+        buildings: dict[tuple[int, int], Building]
+    ) -> None:
+        """Updates the objective position of the firefly.
+
+        Parameters:
+            entities: The list of entities in the game currently.
+            buildings: A dictionary mapping the position of buildings to the
+                       buildings themselves.
+
+        Preconditions:
+            <entities> is sorted in descending priority order.
+        """
+        objective_building = None
+        objective_health = MAX_BUILDING_HEALTH + 1
+        objective_position = None
+        
+        for building_pos in buildings:
+            building = buildings[building_pos]
+            update_building = False
+            
+            if (0 < int(str(building)) < objective_health
+                or (int(str(building)) == objective_health
+                    and (building_pos[0] > objective_position[0]
+                         or (building_pos[0] == objective_position[0]
+                             and building_pos[1] > objective_position[1])))
+                ):
+                objective_building = building
+                objective_health = int(str(building))
+                objective_position = building_pos
+
+        if objective_building:
+            self._objective = objective_position
+        else:
+            self._objective = self.get_position()
@@ -0,0 +1,193 @@
+"""Seeded generator for large levels in the format read by read_file.
+
+The outer ring of every generated level is mountains, as in the bundled
+levels. Buildings and entities are placed on distinct interior cells, and the
+remaining interior cells are mountains with the given probability. The tiles
+are written one row at a time, so only the building and entity positions are
+held in memory, for example:
+
+    python -m breach.generate big.txt --rows 5000 --columns 5000 \
+        --buildings 2000 --tanks 20 --heals 10 --scorpions 50 --fireflies 50
+"""
+import argparse
+import os
+import random
+import sys
+from typing import Optional, TextIO
+
+from breach.constants import *
+
+# Default (health, speed, strength) of each entity type
+DEFAULT_STATS = {
+    TANK_SYMBOL: (5, 3, 3),
+    HEAL_SYMBOL: (3, 3, 2),
+    SCORPION_SYMBOL: (3, 3, 2),
+    FIREFLY_SYMBOL: (2, 2, 1)
+}
+# Entity types in the order their lines are written, which is descending
+# priority order
+ENTITY_ORDER = (TANK_SYMBOL, HEAL_SYMBOL, SCORPION_SYMBOL, FIREFLY_SYMBOL)
+
+
+def generate_level(
+    file: TextIO,
+    rows: int,
+    columns: int,
+    mountain_density: float = 0.1,
+    buildings: int = 1,
+    building_health: tuple[int, int] = (1, MAX_BUILDING_HEALTH),
+    entities: Optional[dict[str, int]] = None,
+    stats: Optional[dict[str, tuple[int, int, int]]] = None,
+    seed: Optional[int] = None
+) -> None:
+    """Writes a random level to <file>, one row of tiles at a time.
+
+    Parameters:
+        file: The text stream to write the level to.
+        rows: The number of rows, including the mountain border.
+        columns: The number of columns, including the mountain border.
+        mountain_density: The probability of each free interior cell being a
+                          mountain.
+        buildings: The number of buildings.
+        building_health: The (lowest, highest) initial building health.
+        entities: The number of entities of each type, keyed by symbol
+                  (default: one tank mech and one scorpion).
+        stats: The (health, speed, strength) of each entity type, keyed by
+               symbol, for types that differ from DEFAULT_STATS.
+        seed: Seed for the random layout.
+
+    Raises:
+        ValueError: If the parameters do not describe a valid level.
+    """
+    if entities is None:
+        entities = {TANK_SYMBOL: 1, SCORPION_SYMBOL: 1}
+    stats = {**DEFAULT_STATS, **(stats or {})}
+    low, high = building_health
+    if rows < 3 or columns < 3:
+        raise ValueError("A level needs at least 3 rows and 3 columns")
+    if not 0 <= mountain_density <= 1:
+        raise ValueError("The mountain density must be between 0 and 1")
+    if not 0 <= low <= high <= MAX_BUILDING_HEALTH:
+        raise ValueError(
+            f"Building health must be between 0 and {MAX_BUILDING_HEALTH}"
+        )
+    unknown = (set(entities) | set(stats)) - set(ENTITY_ORDER)
+    if unknown:
+        raise ValueError(f"Unknown entity symbols: {sorted(unknown)}")
+    counts = [entities.get(symbol, 0) for symbol in ENTITY_ORDER]
+    inner_columns = columns - 2
+    inner_cells = (rows - 2) * inner_columns
+    if buildings < 0 or min(counts) < 0:
+        raise ValueError("Counts cannot be negative")
+    if buildings + sum(counts) > inner_cells:
+        raise ValueError(
+            f"{buildings + sum(counts)} buildings and entities do not fit in "
+            f"{inner_cells} interior cells"
+        )
+
+    rng = random.Random(seed)
+    # Distinct interior cells, as indices into the interior in row order
+    # (sampling a range does not build the list of cells)
+    cells = rng.sample(range(inner_cells), buildings + sum(counts))
+    # Tiles other than ground or mountain, by row then column
+    fixed = {}
+    for cell in cells[:buildings]:
+        row, column = divmod(cell, inner_columns)
+        health = str(rng.randint(low, high))
+        fixed.setdefault(row + 1, {})[column + 1] = health
+    for cell in cells[buildings:]:
+        row, column = divmod(cell, inner_columns)
+        fixed.setdefault(row + 1, {})[column + 1] = GROUND_SYMBOL
+
+    border = MOUNTAIN_SYMBOL * columns + "\n"
+    file.write(border)
+    random_number = rng.random
+    for row in range(1, rows - 1):
+        tiles = [MOUNTAIN_SYMBOL] + [
+            MOUNTAIN_SYMBOL if random_number() < mountain_density
+            else GROUND_SYMBOL
+            for _ in range(inner_columns)
+        ] + [MOUNTAIN_SYMBOL]
+        for column, symbol in fixed.get(row, {}).items():
+            tiles[column] = symbol
+        file.write("".join(tiles) + "\n")
+    file.write(border)
+    file.write("\n")
+
+    entity_cells = iter(cells[buildings:])
+    for symbol, count in zip(ENTITY_ORDER, counts):
+        health, speed, strength = stats[symbol]
+        for _ in range(count):
+            row, column = divmod(next(entity_cells), inner_columns)
+            file.write(
+                f"{symbol},{row + 1},{column + 1},{health},{speed},{strength}\n"
+            )
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Runs the level generator from the command line."""
+    parser = argparse.ArgumentParser(
+        description="Generate a random Into The Breach level."
+    )
+    parser.add_argument("output", help="file to write, or - for stdout")
+    parser.add_argument("--rows", type=int, default=10)
+    parser.add_argument("--columns", type=int, default=10)
+    parser.add_argument("--mountains", type=float, default=0.1,
+                        help="mountain density of the free interior cells")
+    parser.add_argument("--buildings", type=int, default=1)
+    parser.add_argument(
+        "--building-health",
+        type=int,
+        nargs=2,
+        default=(1, MAX_BUILDING_HEALTH),
+        metavar=("LOWEST", "HIGHEST")
+    )
+    parser.add_argument("--tanks", type=int, default=1)
+    parser.add_argument("--heals", type=int, default=0)
+    parser.add_argument("--scorpions", type=int, default=1)
+    parser.add_argument("--fireflies", type=int, default=0)
+    parser.add_argument(
+        "--stats",
+        nargs=4,
+        action="append",
+        default=[],
+        metavar=("SYMBOL", "HEALTH", "SPEED", "STRENGTH"),
+        help="override the stats of one entity type, e.g. --stats T 5 3 3"
+    )
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    entities = {
+        TANK_SYMBOL: args.tanks,
+        HEAL_SYMBOL: args.heals,
+        SCORPION_SYMBOL: args.scorpions,
+        FIREFLY_SYMBOL: args.fireflies
+    }
+    stats = {
+        symbol: (int(health), int(speed), int(strength))
+        for symbol, health, speed, strength in args.stats
+    }
+    options = dict(
+        rows=args.rows,
+        columns=args.columns,
+        mountain_density=args.mountains,
+        buildings=args.buildings,
+        building_health=tuple(args.building_health),
+        entities=entities,
+        stats=stats,
+        seed=args.seed
+    )
+    try:
+        if args.output == "-":
+            generate_level(sys.stdout, **options)
+        else:
+            with open(args.output, "w") as file:
+                generate_level(file, **options)
+    except ValueError as error:
+        if args.output != "-":
+            os.remove(args.output)
+        parser.error(str(error))
+
+
+if __name__ == "__main__":
+    main()
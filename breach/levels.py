@@ -0,0 +1,183 @@
+"""Reading and writing level files."""
+import io
+import os
+from functools import lru_cache
+from typing import TextIO
+
+from breach.constants import *
+from breach.board import Board, CompactBoard
+from breach.entities import (
+    Entity, TankMech, HealMech, Scorpion, Firefly
+)
+from breach.model import BreachModel
+
+# The entity class for each symbol used in level files
+ENTITY_TYPES = {
+    TANK_SYMBOL: TankMech,
+    HEAL_SYMBOL: HealMech,
+    SCORPION_SYMBOL: Scorpion,
+    FIREFLY_SYMBOL: Firefly
+}
+# Maximum number of parsed levels kept by load_level
+LEVEL_CACHE_SIZE = 32
+_TILE_SYMBOLS = set(ALLOWABLE_HEALTHS) | set(SYMBOL_KINDS)
+
+
+class LevelError(ValueError):
+    """Raised when the contents of a level file are malformed."""
+
+
+class LevelTemplate():
+    """An immutable, parsed level from which any number of new games can be
+    created without reading the file again."""
+
+    def __init__(
+        self,
+        rows: tuple[str, ...],
+        entities: tuple[tuple[str, int, int, int, int, int], ...]
+    ) -> None:
+        """Constructs a template from parsed level contents.
+
+        Parameters:
+            rows: The tile symbols of each row, as strings.
+            entities: (symbol, row, column, health, speed, strength) for each
+                      entity, in descending priority order.
+        """
+        self._rows = rows
+        self._entities = entities
+
+    @classmethod
+    def from_model(cls, model: BreachModel) -> "LevelTemplate":
+        """Returns a template of the current state of <model>, as it would
+        be saved to a level file."""
+        return parse_level(io.StringIO(str(model)), "<model>")
+
+    def get_dimensions(self) -> tuple[int, int]:
+        """Returns the (#rows, #columns) of the level's board."""
+        return len(self._rows), len(self._rows[0])
+
+    def get_tiles(self) -> list[list[str]]:
+        """Returns a new list of the tiles as their string representations,
+        one list per row."""
+        return [list(row) for row in self._rows]
+
+    def create_entities(self) -> list[Entity]:
+        """Returns new instances of the level's entities, in descending
+        priority order."""
+        return [
+            ENTITY_TYPES[symbol]((row, column), health, speed, strength)
+            for symbol, row, column, health, speed, strength in self._entities
+        ]
+
+    def create_model(self, compact: bool = False) -> BreachModel:
+        """Returns a new game of this level.
+
+        Parameters:
+            compact: If True, the board is a CompactBoard.
+        """
+        if compact:
+            board = CompactBoard(self._rows)
+        else:
+            board = Board(self._rows)
+        return BreachModel(board, self.create_entities())
+
+
+def parse_level(file: TextIO, name: str) -> LevelTemplate:
+    """Parses the level in <file> into a template.
+
+    Parameters:
+        file: The open level file.
+        name: The name of the file, used in error messages.
+
+    Raises:
+        LevelError: If the contents of the file are malformed.
+    """
+    rows = []
+    entities = []
+    line_number = 1
+    line = file.readline().strip()
+    # Reads the tile portion
+    while line != '':
+        unknown = set(line) - _TILE_SYMBOLS
+        if unknown:
+            raise LevelError(
+                f"{name}, line {line_number}: unknown tiles {sorted(unknown)}"
+            )
+        if rows and len(line) != len(rows[0]):
+            raise LevelError(
+                f"{name}, line {line_number}: expected {len(rows[0])} tiles"
+            )
+        rows.append(line)
+        line_number += 1
+        line = file.readline().strip()
+    if not rows:
+        raise LevelError(f"{name}: the level has no tiles")
+
+    line = file.readline().strip() # Skips the blank line in the file
+    line_number += 1
+
+    # Reads the entity portion
+    while line != '':
+        attributes = line.split(',')
+        if len(attributes) != 6 or attributes[0] not in ENTITY_TYPES:
+            raise LevelError(f"{name}, line {line_number}: invalid entity")
+        try:
+            values = tuple(int(attribute) for attribute in attributes[1:])
+        except ValueError:
+            raise LevelError(f"{name}, line {line_number}: invalid entity")
+        entities.append((attributes[0],) + values)
+        line_number += 1
+        line = file.readline().strip()
+
+    return LevelTemplate(tuple(rows), tuple(entities))
+
+
+@lru_cache(maxsize=LEVEL_CACHE_SIZE)
+def _load_cached_level(path: str, modified: int) -> LevelTemplate:
+    """Parses the level at <path>. Cached by path and modification time, so
+    a file that changes on disk is parsed again."""
+    with open(path, 'r') as file:
+        return parse_level(file, path)
+
+
+def load_level(game_file: str) -> LevelTemplate:
+    """Returns the parsed template of a level file. Each file is parsed once
+    and kept in a bounded cache until it is modified or evicted.
+
+    Parameters:
+        game_file: The level file to load.
+
+    Raises:
+        IOError: If the file cannot be opened.
+        LevelError: If the contents of the file are malformed.
+    """
+    path = os.path.abspath(game_file)
+    return _load_cached_level(path, os.stat(path).st_mtime_ns)
+
+
+def clear_level_cache() -> None:
+    """Forgets every level parsed by load_level."""
+    _load_cached_level.cache_clear()
+
+
+def read_file(game_file: str) -> tuple[list[list[str]], list[list[Entity]]]:
+    """Reads a game file and returns a list of the tiles and a list of the
+    entities in the file.
+
+    Parameters:
+        game_file: The file to be read.
+
+    Returns:
+        tuple[list[list[str]], list[list[Entity]]]: A tuple of the list of
+                                                    list of tiles as their
+                                                    string representations
+                                                    and the list of list of
+                                                    entities as objects.
+
+    Raises:
+        IOError: If the file cannot be opened.
+        LevelError: If the contents of the file are malformed.
+    """
+    with open(game_file, 'r') as file:
+        template = parse_level(file, game_file)
+    return template.get_tiles(), template.create_entities()
@@ -0,0 +1,1155 @@
+"""The model component of Into The Breach."""
+import copy
+import heapq
+from collections import deque
+from functools import lru_cache
+from typing import Optional
+
+from breach.constants import *
+from breach.tiles import Building
+from breach.board import Board
+from breach.entities import Entity
+
+_MASK = (1 << 64) - 1
+# Tags that keep the Zobrist keys of buildings and entities apart
+_BUILDING_TAG = 1
+_ENTITY_TAG = 2
+# Number of recently used Zobrist keys kept, since mixing a key costs far
+# more than looking it up
+_ZOBRIST_CACHE_SIZE = 1 << 16
+# Number of turn previews kept by each game, most recent first out
+PREVIEW_CACHE_SIZE = 16
+# The containers a game shares with its forks until it first changes them
+_SHARED_CONTAINERS = (
+    "_entities",
+    "_entity_positions",
+    "_entity_indices",
+    "_buildings"
+)
+
+
+def _mix(value: int) -> int:
+    """Returns the 64-bit splitmix64 mix of <value>."""
+    value = (value + 0x9E3779B97F4A7C15) & _MASK
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK
+    return value ^ (value >> 31)
+
+
+@lru_cache(maxsize=_ZOBRIST_CACHE_SIZE)
+def _zobrist_key(*values: int) -> int:
+    """Returns the 64-bit Zobrist key of a combination of <values>. Keys are
+    derived from the values rather than drawn from a table, so they are the
+    same in every process and need no storage per cell."""
+    key = 0
+    for value in values:
+        key = _mix(key ^ value)
+    return key
+
+
+class TurnPreview():
+    """The predicted outcome of ending the turn in a particular game state.
+    Every position is where a tile or entity is before the turn is ended, so
+    a preview holds no references to the game's objects."""
+
+    def __init__(
+        self,
+        cell_damage: dict[tuple[int, int], int],
+        entity_damage: dict[tuple[int, int], int],
+        destinations: dict[tuple[int, int], tuple[int, int]]
+    ) -> None:
+        """Constructs a preview.
+
+        Parameters:
+            cell_damage: The net damage to the building and entity on each
+                         cell that loses (or, if negative, gains) health.
+            entity_damage: The net damage to the entity at each position
+                           whose health changes.
+            destinations: The position each surviving enemy moves to, keyed
+                          by its current position.
+        """
+        self._cell_damage = cell_damage
+        self._entity_damage = entity_damage
+        self._destinations = destinations
+
+    def get_cell_damage(self) -> dict[tuple[int, int], int]:
+        """Returns the net damage predicted on each cell whose building or
+        entity changes health. The dictionary must not be modified."""
+        return self._cell_damage
+
+    def get_entity_damage(self) -> dict[tuple[int, int], int]:
+        """Returns the net damage predicted for each entity whose health
+        changes, keyed by the entity's position. The dictionary must not be
+        modified."""
+        return self._entity_damage
+
+    def get_destinations(self) -> dict[tuple[int, int], tuple[int, int]]:
+        """Returns the position each enemy that survives the attack phase is
+        predicted to move to, keyed by its position. The dictionary must not
+        be modified."""
+        return self._destinations
+
+
+class _DistanceField():
+    """Shortest path distances from one position, following the same rules
+    as BreachModel._distances_from, found one level (distance) at a time and
+    only as far as they are needed. The field is kept up to date as entities
+    move, and only the distances that a move changes are recomputed."""
+
+    def __init__(self, model: 'BreachModel', origin: tuple[int, int]) -> None:
+        """Constructs a field that holds just <origin>, at distance 0.
+
+        Parameters:
+            model: The game whose board and entities block paths.
+            origin: The (row, column) position to measure distances from.
+        """
+        self._model = model
+        self._origin = origin
+        self._distances = {origin: 0}
+        # The positions at each distance. Every position up to the last
+        # level is present, so the next level can be found from the last.
+        self._levels = [{origin}]
+
+    def closest(
+        self,
+        positions: set[tuple[int, int]]
+    ) -> Optional[tuple[int, int]]:
+        """Returns the position in <positions> nearest to the origin, other
+        than the origin itself. Of equally near positions, the one in the
+        lowest row and then the rightmost column is returned. The field is
+        only expanded to the distance of that position.
+
+        Parameters:
+            positions: The (row, column) positions to choose from.
+
+        Returns:
+            Optional[tuple[int, int]]: The closest position, or None if none
+                                       of <positions> can be reached.
+        """
+        reached = []
+        for position in positions:
+            distance = self._distances.get(position, 0)
+            if distance > 0:
+                reached.append((distance, position))
+        if reached:
+            nearest = min(reached)[0]
+            return max(
+                position
+                for distance, position in reached
+                if distance == nearest
+            )
+        while True:
+            level = self._expand()
+            if not level:
+                return None
+            matches = [position for position in level if position in positions]
+            if matches:
+                return max(matches)
+
+    def _is_open(self, position: tuple[int, int]) -> bool:
+        """Returns True iff a path may pass through <position>."""
+        rows, columns = self._model.get_board().get_dimensions()
+        return (0 <= position[0] < rows
+            and 0 <= position[1] < columns
+            and position not in self._model.entity_positions()
+            and not self._model.get_board().get_tile(position).is_blocking()
+            )
+
+    def _expand(self) -> set[tuple[int, int]]:
+        """Finds, records and returns the positions one further from the
+        origin than the furthest found so far."""
+        rows, columns = self._model.get_board().get_dimensions()
+        get_tile = self._model.get_board().get_tile
+        entity_tiles = self._model.entity_positions()
+        distances = self._distances
+        new_distance = len(self._levels)
+        level = set()
+        for node in self._levels[-1]:
+            for delta in PLUS_OFFSETS:
+                new_node = (node[0] + delta[0], node[1] + delta[1])
+                if (0 <= new_node[0] < rows
+                    and 0 <= new_node[1] < columns
+                    and new_node not in distances
+                    and new_node not in entity_tiles
+                    and not get_tile(new_node).is_blocking()
+                    ):
+                    distances[new_node] = new_distance
+                    level.add(new_node)
+        if level:
+            self._levels.append(level)
+        return level
+
+    def _set_distance(self, position: tuple[int, int], distance: int) -> None:
+        """Records <distance> as the distance of <position>, moving it out of
+        the level it was in."""
+        old_distance = self._distances.get(position)
+        if old_distance is not None:
+            self._levels[old_distance].discard(position)
+        self._distances[position] = distance
+        self._levels[distance].add(position)
+
+    def update(
+        self,
+        vacated: Optional[tuple[int, int]],
+        occupied: tuple[int, int]
+    ) -> None:
+        """Brings the field up to date after an entity has moved from
+        <vacated> to <occupied>.
+
+        Parameters:
+            vacated: The position the entity left, or None if another entity
+                     is still there.
+            occupied: The position the entity moved to.
+        """
+        if occupied != self._origin and occupied in self._distances:
+            self._block(occupied)
+        if (vacated is not None
+            and vacated != self._origin
+            and vacated not in self._distances
+            and self._is_open(vacated)
+            ):
+            self._free(vacated)
+
+    def _block(self, position: tuple[int, int]) -> None:
+        """Updates the field now that <position>, which is in it, cannot be
+        passed through. Only the positions every one of whose shortest paths
+        went through <position> are further away now, so only their
+        distances are recomputed."""
+        distances = self._distances
+        furthest = len(self._levels) - 1
+        distance = distances.pop(position)
+        self._levels[distance].discard(position)
+
+        # Find the positions that have lost every shortest path, a level at
+        # a time
+        changed = []
+        level = [position]
+        while level and distance < furthest:
+            distance += 1
+            next_level = []
+            for node in level:
+                for delta in PLUS_OFFSETS:
+                    new_node = (node[0] + delta[0], node[1] + delta[1])
+                    if distances.get(new_node) != distance:
+                        continue
+                    if not any(
+                        distances.get(
+                            (new_node[0] + step[0], new_node[1] + step[1])
+                        ) == distance - 1
+                        for step in PLUS_OFFSETS
+                    ):
+                        del distances[new_node]
+                        self._levels[distance].discard(new_node)
+                        next_level.append(new_node)
+            changed.extend(next_level)
+            level = next_level
+        if not changed:
+            return
+
+        # Their new distances come from their nearest neighbours that kept
+        # theirs, spreading through the others in order of distance. Those
+        # now beyond the last level are left to be found by _expand.
+        lost = set(changed)
+        queue = []
+        for node in changed:
+            nearest = min(
+                (
+                    distances[neighbour]
+                    for neighbour in (
+                        (node[0] + step[0], node[1] + step[1])
+                        for step in PLUS_OFFSETS
+                    )
+                    if neighbour in distances
+                ),
+                default=None
+            )
+            if nearest is not None and nearest < furthest:
+                heapq.heappush(queue, (nearest + 1, node))
+        while queue:
+            distance, node = heapq.heappop(queue)
+            if node not in lost:
+                continue
+            lost.discard(node)
+            self._set_distance(node, distance)
+            if distance < furthest:
+                for delta in PLUS_OFFSETS:
+                    new_node = (node[0] + delta[0], node[1] + delta[1])
+                    if new_node in lost:
+                        heapq.heappush(queue, (distance + 1, new_node))
+
+    def _free(self, position: tuple[int, int]) -> None:
+        """Updates the field now that <position>, which is not in it, can be
+        passed through. Only positions that are nearer through <position>
+        change, so the search spreads from it no further than them."""
+        distances = self._distances
+        furthest = len(self._levels) - 1
+        nearest = min(
+            (
+                distances[neighbour]
+                for neighbour in (
+                    (position[0] + step[0], position[1] + step[1])
+                    for step in PLUS_OFFSETS
+                )
+                if neighbour in distances
+            ),
+            default=None
+        )
+        if nearest is None or nearest >= furthest:
+            # <position> is at or beyond the next level, which _expand finds
+            return
+        self._set_distance(position, nearest + 1)
+        frontier = deque([position])
+        while frontier:
+            node = frontier.popleft()
+            new_distance = distances[node] + 1
+            if new_distance > furthest:
+                continue
+            for delta in PLUS_OFFSETS:
+                new_node = (node[0] + delta[0], node[1] + delta[1])
+                old_distance = distances.get(new_node)
+                if old_distance is not None:
+                    if old_distance > new_distance:
+                        self._set_distance(new_node, new_distance)
+                        frontier.append(new_node)
+                elif self._is_open(new_node):
+                    self._set_distance(new_node, new_distance)
+                    frontier.append(new_node)
+
+
+class BreachModel():
+    """The class for the model component of Into The Breach."""
+    
+    def __init__(self, board: Board, entities: list[Entity]) -> None:
+        """Constructor for the breach model.
+
+        Parameters:
+            board: The board for the game.
+            entites: The list of entities on the board.
+
+        Preconditions:
+            <entities> is sorted in descending priority order.
+        """
+        self._board = board
+        self._entities = entities
+        self._buildings = self._board.get_buildings()
+        # Live index of every entity by position, kept up to date by
+        # _move_entity and remove_dead_entities
+        self._entity_positions = {
+            entity.get_position(): entity for entity in entities
+        }
+        # Attack offsets per entity type, and the board-clipped targets per
+        # (entity type, position), both filled in as they are first needed
+        self._attack_offsets = {}
+        self._attack_targets = {}
+        # Running counts used by has_won and has_lost
+        self._living_mechs = 0
+        self._living_enemies = 0
+        for entity in entities:
+            if entity.is_alive():
+                self._update_counts(entity, 1)
+        self._standing_buildings = sum(
+            not building.is_destroyed()
+            for building in self._buildings.values()
+        )
+        # Journal of this turn's moves as (mech, from, to, was active)
+        # deltas. Undone moves are kept for redo until a new move is made.
+        self._undo_stack = []
+        self._redo_stack = []
+        # Copy-on-write state for fork. _owned holds the entities this game
+        # may change in place (None means all of them), _aliases maps an
+        # entity that was copied before being changed to its copy until the
+        # end of the turn, and _entity_indices maps entities to their index
+        # in _entities. _shared names the containers in _SHARED_CONTAINERS
+        # that this game shares with a fork and must copy before changing.
+        self._owned = None
+        self._aliases = {}
+        self._entity_indices = None
+        self._shared = set()
+        # Zobrist hash of the game state, computed by the first call to
+        # state_hash and then updated by every change the model makes
+        self._hash = None
+        # Turn previews by state hash. Equal states have equal previews, so
+        # the cache is shared with forks.
+        self._previews = {}
+        # Cells whose tile or entity has changed since the last call to
+        # take_dirty_cells, or None until it is first called
+        self._dirty_cells = None
+        # Struct-of-arrays table of the entities and buildings for the
+        # vectorized attack phase (see combat.CombatTable), built by the first
+        # vectorized turn and then kept up to date by every change the model
+        # makes
+        self._combat_table = None
+
+    def __str__(self) -> str:
+        """Returns a string representation of the breach model which includes
+        the string representations of the board and all entities currently in
+        the game."""
+        board_string = str(self._board)
+        entities_string = '\n'.join([str(entity) for entity in self._entities])
+        return board_string + '\n\n' + entities_string
+
+    def __eq__(self, other: object) -> bool:
+        """Returns True if <other> is a game in the same state: the same
+        tiles and entities, and the same mechs still to move this turn.
+        Games are only compared in full when their state hashes match."""
+        if not isinstance(other, BreachModel):
+            return NotImplemented
+        if self.state_hash() != other.state_hash():
+            return False
+        return str(self) == str(other) and all(
+            self._is_active(entity) == other._is_active(other_entity)
+            for entity, other_entity in zip(self._entities, other._entities)
+        )
+
+    # Games change as they are played, so they cannot be dictionary keys;
+    # use state_hash instead
+    __hash__ = None
+
+    def state_hash(self) -> int:
+        """Returns a 64-bit Zobrist hash of the game state, covering the kind
+        of every tile, the health of every building, and the type, position
+        and health of every entity and whether each mech is active. Equal
+        states have equal hashes, in any process.
+
+        The first call hashes the whole game. After that the hash is updated
+        as the game changes, so each call takes constant time.
+        """
+        if self._hash is None:
+            state_hash = self._board.terrain_hash()
+            for position, building in self._buildings.items():
+                state_hash ^= _building_key(position, building)
+            for entity in self._entities:
+                state_hash ^= _entity_key(entity)
+            self._hash = state_hash
+        return self._hash
+
+    @staticmethod
+    def _is_active(entity: Entity) -> bool:
+        """Returns True if <entity> is a mech that has not moved this turn."""
+        return entity.get_name() in MECH_NAMES and entity.is_active()
+
+    def fork(self) -> "BreachModel":
+        """Returns a copy of this game that can be played independently of
+        it, for lookahead. Terrain is shared between the two for good, and
+        entities and buildings, and the containers that hold them, are
+        shared until one of the games changes them, at which point that game
+        makes its own copy. Forking therefore takes constant time, apart from
+        copying the move journals of this turn.
+
+        Entities currently in this game may be passed to the fork's methods,
+        which act on the fork's copy of them, until the fork's turn is ended.
+        """
+        fork = copy.copy(self)
+        fork._board = self._board.fork()
+        # The fork starts with none of this game's aliases, so forking costs
+        # nothing more however many copies this game has made. The move
+        # journals are the one place that can hold older versions of
+        # entities, so they are given the current versions.
+        fork._undo_stack = self._current_deltas(self._undo_stack)
+        fork._redo_stack = self._current_deltas(self._redo_stack)
+        fork._aliases = {}
+        # Shared along with the entity list, so the fork's first change to
+        # an entity does not have to index every entity
+        self._indices()
+        fork._dirty_cells = None
+        fork._combat_table = None
+        # Every entity and container is now shared, so both games copy one
+        # before changing it
+        self._owned = set()
+        fork._owned = set()
+        self._shared = set(_SHARED_CONTAINERS)
+        fork._shared = set(_SHARED_CONTAINERS)
+        return fork
+
+    def _unshare(self, name: str) -> None:
+        """Replaces the container attribute <name> with a copy of it if it
+        is shared with a fork, so that this game may change it in place.
+
+        Parameters:
+            name: One of _SHARED_CONTAINERS.
+        """
+        if name in self._shared:
+            self._shared.discard(name)
+            setattr(self, name, copy.copy(getattr(self, name)))
+
+    def _current_deltas(self, deltas: list[tuple]) -> list[tuple]:
+        """Returns a copy of the move journal <deltas> in which every mech is
+        this game's current version of it."""
+        return [
+            (self._resolve(entity), origin, destination, was_active)
+            for entity, origin, destination, was_active in deltas
+        ]
+
+    def take_dirty_cells(self) -> set[tuple[int, int]]:
+        """Returns the positions of the cells whose tile or entity has
+        changed since the last call, and starts collecting afresh. Cells are
+        only collected once this has been called, so the first call returns
+        an empty set and the caller should treat every cell as changed."""
+        dirty = self._dirty_cells
+        self._dirty_cells = set()
+        return dirty if dirty is not None else set()
+
+    def _resolve(self, entity: Entity) -> Entity:
+        """Returns this game's current version of <entity>, which is a copy
+        of it if it was copied before being changed.
+
+        Parameters:
+            entity: An entity from this game, or one that was in the game it
+                    was forked from at the time of the fork.
+        """
+        original = entity
+        alias = self._aliases.get(entity)
+        while alias is not None:
+            entity = alias
+            alias = self._aliases.get(entity)
+        if entity is not original:
+            # Points the original straight at the latest copy, so chains of
+            # copies are only followed once
+            self._aliases[original] = entity
+        return entity
+
+    def _own(self, entity: Entity) -> Entity:
+        """Returns the version of <entity> that this game may change in
+        place, first replacing it with a copy if it is shared with a fork.
+        Entities must be fetched with this method before they are changed.
+
+        Parameters:
+            entity: An entity from this game, or one that was in the game it
+                    was forked from at the time of the fork.
+
+        Preconditions:
+            <entity> has not been removed from the game.
+        """
+        entity = self._resolve(entity)
+        if self._owned is None or entity in self._owned:
+            return entity
+        clone = copy.copy(entity)
+        index = self._index_of(entity)
+        self._unshare("_entity_indices")
+        del self._entity_indices[entity]
+        self._entity_indices[clone] = index
+        self._unshare("_entities")
+        self._entities[index] = clone
+        position = clone.get_position()
+        if self._entity_positions.get(position) is entity:
+            self._unshare("_entity_positions")
+            self._entity_positions[position] = clone
+        self._aliases[entity] = clone
+        self._owned.add(clone)
+        return clone
+
+    def _indices(self) -> dict[Entity, int]:
+        """Returns the map of every entity to its index in _entities,
+        building it if it has been invalidated."""
+        if self._entity_indices is None:
+            self._entity_indices = {
+                entity: index for index, entity in enumerate(self._entities)
+            }
+            self._shared.discard("_entity_indices")
+        return self._entity_indices
+
+    def _index_of(self, entity: Entity) -> int:
+        """Returns the index in _entities of <entity>, which must be this
+        game's current version of it."""
+        return self._indices()[entity]
+
+    def get_board(self) -> Board:
+        """Returns the current board instance."""
+        return self._board
+
+    def get_entities(self) -> list[Entity]:
+        """Returns a list of the all entities in the game, listed in descending
+        priority order starting from the first element."""
+        return self._entities
+
+    def get_buildings(self) -> dict[tuple[int, int], Building]:
+        """Returns a dictionary of the position of every building mapped to
+        the building instance itself. The dictionary belongs to the model and
+        must not be modified by the caller."""
+        return self._buildings
+
+    def has_won(self) -> bool:
+        """Returns True if and only if the game is in a win state."""
+        return (
+            self._living_mechs > 0
+            and self._standing_buildings > 0
+            and self._living_enemies == 0
+        )
+
+    def has_lost(self) -> bool:
+        """Returns True if and only if the game is in a loss state."""
+        return self._living_mechs == 0 or self._standing_buildings == 0
+
+    def _update_counts(self, entity: Entity, change: int) -> None:
+        """Adds <change> to the running count of living units that <entity>
+        belongs to.
+
+        Parameters:
+            entity: The entity whose state changed.
+            change: 1 if the entity came alive, -1 if it died.
+        """
+        if entity.get_name() in MECH_NAMES:
+            self._living_mechs += change
+        elif entity.get_name() in ENEMY_NAMES:
+            self._living_enemies += change
+
+    def _attack_entity(self, attacker: Entity, target: Entity) -> None:
+        """Makes <attacker> attack <target>, keeping the unit counts up to
+        date.
+
+        Parameters:
+            attacker: The entity making the attack.
+            target: The entity being attacked (or healed).
+        """
+        target = self._own(target)
+        was_alive = target.is_alive()
+        if self._hash is not None:
+            self._hash ^= _entity_key(target)
+        attacker.attack(target)
+        if self._hash is not None:
+            self._hash ^= _entity_key(target)
+        if self._dirty_cells is not None:
+            self._dirty_cells.add(target.get_position())
+        if self._combat_table is not None:
+            self._combat_table.set_health(
+                self._index_of(target),
+                target.get_health()
+            )
+        if was_alive != target.is_alive():
+            self._update_counts(target, -1 if was_alive else 1)
+
+    def _damage_entity(self, entity: Entity, damage: int) -> None:
+        """Damages <entity> by <damage>, keeping the unit counts up to date.
+
+        Parameters:
+            entity: The entity to damage.
+            damage: The amount of damage (negative to heal).
+        """
+        entity = self._own(entity)
+        was_alive = entity.is_alive()
+        if self._hash is not None:
+            self._hash ^= _entity_key(entity)
+        entity.damage(damage)
+        if self._hash is not None:
+            self._hash ^= _entity_key(entity)
+        if self._dirty_cells is not None:
+            self._dirty_cells.add(entity.get_position())
+        if self._combat_table is not None:
+            self._combat_table.set_health(
+                self._index_of(entity),
+                entity.get_health()
+            )
+        if was_alive != entity.is_alive():
+            self._update_counts(entity, -1 if was_alive else 1)
+
+    def _damage_building(self, position: tuple[int, int], damage: int) -> None:
+        """Damages the building at <position> by <damage>, keeping the
+        building count up to date.
+
+        Parameters:
+            position: The (row, column) position of the building to damage.
+            damage: The amount of damage (negative to repair).
+        """
+        building = self._board.own_building(position)
+        if "_buildings" in self._shared:
+            # Rebuilt rather than copied, since the board may have replaced
+            # the objects of the buildings it shared along with this one
+            self._shared.discard("_buildings")
+            get_tile = self._board.get_tile
+            self._buildings = {
+                position: get_tile(position) for position in self._buildings
+            }
+        self._buildings[position] = building
+        was_destroyed = building.is_destroyed()
+        if self._hash is not None:
+            self._hash ^= _building_key(position, building)
+        building.damage(damage)
+        if self._hash is not None:
+            self._hash ^= _building_key(position, building)
+        if self._dirty_cells is not None:
+            self._dirty_cells.add(position)
+        if self._combat_table is not None:
+            self._combat_table.set_building_health(
+                position,
+                int(str(building))
+            )
+        if was_destroyed != building.is_destroyed():
+            self._standing_buildings += 1 if was_destroyed else -1
+
+    def entity_positions(self) -> dict[tuple[int, int], Entity]:
+        """Returns a dictionary containing all entities, indexed by their
+        position. The dictionary is the model's live index, so it must not be
+        modified by the caller."""
+        return self._entity_positions
+
+    def _move_entity(self, entity: Entity, position: tuple[int, int]) -> None:
+        """Moves <entity> to <position> and updates the position index.
+
+        Parameters:
+            entity: The entity to move.
+            position: The (row, column) position to move the entity to.
+        """
+        entity = self._own(entity)
+        old_position = entity.get_position()
+        self._unshare("_entity_positions")
+        if self._entity_positions.get(old_position) is entity:
+            del self._entity_positions[old_position]
+        if self._hash is not None:
+            self._hash ^= _entity_key(entity)
+        entity.set_position(position)
+        if self._hash is not None:
+            self._hash ^= _entity_key(entity)
+        if self._dirty_cells is not None:
+            self._dirty_cells.add(old_position)
+            self._dirty_cells.add(position)
+        if self._combat_table is not None:
+            self._combat_table.set_position(self._index_of(entity), position)
+        self._entity_positions[position] = entity
+
+    def _set_active(self, mech: Entity, active: bool) -> None:
+        """Enables or disables <mech>, keeping the state hash up to date.
+
+        Parameters:
+            mech: The mech to change.
+            active: True to enable the mech, False to disable it.
+        """
+        mech = self._own(mech)
+        if self._hash is not None:
+            self._hash ^= _entity_key(mech)
+        if active:
+            mech.enable()
+        else:
+            mech.disable()
+        if self._hash is not None:
+            self._hash ^= _entity_key(mech)
+        if self._dirty_cells is not None:
+            self._dirty_cells.add(mech.get_position())
+
+    def remove_dead_entities(self) -> list[Entity]:
+        """Removes every dead entity from the game in a single pass, keeping
+        the remaining entities in descending priority order.
+
+        Returns:
+            list[Entity]: The removed entities, in descending priority order.
+        """
+        survivors = []
+        removed = []
+        for entity in self._entities:
+            if entity.is_alive():
+                survivors.append(entity)
+            else:
+                removed.append(entity)
+                if self._hash is not None:
+                    self._hash ^= _entity_key(entity)
+                position = entity.get_position()
+                if self._dirty_cells is not None:
+                    self._dirty_cells.add(position)
+                if self._entity_positions.get(position) is entity:
+                    self._unshare("_entity_positions")
+                    del self._entity_positions[position]
+        if not removed:
+            return removed
+        if self._combat_table is not None:
+            self._combat_table.keep(
+                [entity.is_alive() for entity in self._entities]
+            )
+        if "_entities" in self._shared:
+            # The fork keeps the old list
+            self._shared.discard("_entities")
+            self._entities = survivors
+        else:
+            # Updated in place so references to the entity list stay valid
+            self._entities[:] = survivors
+        self._entity_indices = None
+        self._shared.discard("_entity_indices")
+        if self._aliases:
+            # Forgets the copies made of the removed entities, so they can
+            # be freed
+            gone = set(removed)
+            self._aliases = {
+                entity: alias
+                for entity, alias in list(self._aliases.items())
+                if self._resolve(alias) not in gone
+            }
+        return removed
+
+    def get_valid_movement_positions(
+        self,
+        entity: Entity
+    )-> list[tuple[int, int]]:
+        """Returns the list of positions that the given entity could move to
+        during the relevant moving phase, with positions in higher rows
+        appearing before ones in lower rows and positions further left
+        in the same row appearing before positions further right.
+
+        Parameters:
+            entity: The entity to check the movement positions for.
+
+        Returns:
+            list[tuple[int, int]]: The sorted list of valid movement
+                                   positions, (row, column).
+        """
+        entity = self._resolve(entity)
+        distances = self._distances_from(
+            entity.get_position(),
+            entity.get_speed()
+        )
+        positions = sorted(
+            position
+            for position, distance in distances.items()
+            if distance > 0
+        )
+        return positions
+
+    def _distances_from(
+        self,
+        origin: tuple[int, int],
+        max_distance: Optional[int] = None
+    ) -> dict[tuple[int, int], int]:
+        """Returns the shortest path distance from <origin> to every position
+        that can be reached from it, following the same rules as get_distance
+        (blocking tiles and entities are never entered, but <origin> itself
+        may be one). The search is a single breadth-first expansion, so its
+        cost depends on the size of the reachable area, not the board.
+
+        Parameters:
+            origin: The (row, column) position to search from.
+            max_distance: If given, positions further than this are not
+                          explored.
+
+        Returns:
+            A dictionary mapping each reached position to its distance from
+            <origin>, including <origin> itself at distance 0.
+        """
+        rows, columns = self._board.get_dimensions()
+        get_tile = self._board.get_tile
+        entity_tiles = self.entity_positions()
+        distances = {origin: 0}
+        frontier = deque([origin])
+
+        while frontier:
+            node = frontier.popleft()
+            new_distance = distances[node] + 1
+            if max_distance is not None and new_distance > max_distance:
+                continue
+            for delta in PLUS_OFFSETS:
+                new_node = (node[0] + delta[0], node[1] + delta[1])
+                if (0 <= new_node[0] < rows
+                    and 0 <= new_node[1] < columns
+                    and new_node not in distances
+                    and new_node not in entity_tiles
+                    and not get_tile(new_node).is_blocking()
+                    ):
+                    distances[new_node] = new_distance
+                    frontier.append(new_node)
+
+        return distances
+
+    def get_attack_offsets(
+        self,
+        entity: Entity
+    ) -> tuple[tuple[int, int], ...]:
+        """Returns the (row, column) offsets from an entity's position that
+        entities of the same type as <entity> attack. The offsets are derived
+        once per entity type.
+
+        Parameters:
+            entity: An entity of the type to get the attack offsets of.
+
+        Returns:
+            tuple[tuple[int, int], ...]: The attack offsets, in the same order
+                                         as entity.get_targets().
+        """
+        entity_type = type(entity)
+        offsets = self._attack_offsets.get(entity_type)
+        if offsets is None:
+            # Attack patterns only depend on the entity's type, so they can
+            # be derived from any one instance
+            position = entity.get_position()
+            offsets = self._attack_offsets[entity_type] = tuple(
+                (target[0] - position[0], target[1] - position[1])
+                for target in entity.get_targets()
+            )
+        return offsets
+
+    def get_attack_targets(self, entity: Entity) -> tuple[tuple[int, int], ...]:
+        """Returns the positions on the board that <entity> would attack from
+        its current position, in the same order as entity.get_targets(). The
+        targets are computed once per entity type and position, then reused.
+
+        Parameters:
+            entity: The entity to get the attack targets of.
+
+        Returns:
+            tuple[tuple[int, int], ...]: The in-bounds (row, column) targets.
+        """
+        entity = self._resolve(entity)
+        position = entity.get_position()
+        key = (type(entity), position)
+        targets = self._attack_targets.get(key)
+        if targets is None:
+            offsets = self.get_attack_offsets(entity)
+            rows, columns = self._board.get_dimensions()
+            targets = self._attack_targets[key] = tuple(
+                (position[0] + offset[0], position[1] + offset[1])
+                for offset in offsets
+                if 0 <= position[0] + offset[0] < rows
+                and 0 <= position[1] + offset[1] < columns
+            )
+        return targets
+
+    def attempt_move(self, entity: Entity, position: tuple[int, int]) -> None:
+        """Moves the entity to the specified position only if the entity is
+        friendly, active and can move to that position according to the game
+        rules. Disables the entity after a move is made.
+
+        Parameters:
+            entity: The entity to attempt movement.
+            position: The position to attempt the movement to.
+        """
+        entity = self._resolve(entity)
+        if (position in self.get_valid_movement_positions(entity)
+            and entity.is_friendly()
+            and entity.is_active()
+            ):
+            origin = entity.get_position()
+            was_active = entity.is_active()
+            self._redo_stack.clear()
+            self._move_entity(entity, position)
+            self._set_active(entity, False)
+            # Journalled after the move, which may have replaced the mech
+            # with a copy
+            self._undo_stack.append(
+                (self._resolve(entity), origin, position, was_active)
+            )
+
+    def can_undo(self) -> bool:
+        """Returns True if a move has been made this turn that can be
+        undone."""
+        return bool(self._undo_stack)
+
+    def can_redo(self) -> bool:
+        """Returns True if a move has been undone that can be redone."""
+        return bool(self._redo_stack)
+
+    def undo_move(self) -> Optional[Entity]:
+        """Undoes the most recent move made this turn, returning the mech to
+        its previous position and activation state.
+
+        Returns:
+            Optional[Entity]: The mech that was moved back, or None if there
+                              was no move to undo.
+        """
+        if not self._undo_stack:
+            return None
+        entity, origin, destination, was_active = self._undo_stack.pop()
+        self._move_entity(entity, origin)
+        if was_active:
+            self._set_active(entity, True)
+        entity = self._resolve(entity)
+        self._redo_stack.append((entity, origin, destination, was_active))
+        return entity
+
+    def redo_move(self) -> Optional[Entity]:
+        """Makes the most recently undone move again.
+
+        Returns:
+            Optional[Entity]: The mech that was moved, or None if there was
+                              no move to redo.
+        """
+        if not self._redo_stack:
+            return None
+        entity, origin, destination, was_active = self._redo_stack.pop()
+        self._move_entity(entity, destination)
+        self._set_active(entity, False)
+        entity = self._resolve(entity)
+        self._undo_stack.append((entity, origin, destination, was_active))
+        return entity
+
+    def ready_to_save(self) -> bool:
+        """Returns True only when no move has been made since the last call to
+        end_turn."""
+        mechs_not_active = [
+            entity.get_name() in MECH_NAMES and not entity.is_active()
+            for entity in self._entities
+        ]
+        return not any(mechs_not_active)
+
+    def assign_objectives(self) -> None:
+        """Updates the objectives of all enemies based on the current game
+        state."""
+        self._unshare("_entities")
+        for entity in self._entities:
+            if not entity.is_friendly():
+                self._own(entity).update_objective(
+                    self._entities,
+                    self._buildings
+                )
+
+    def move_enemies(self) -> None:
+        """Moves each enemy to the valid movement position that minimises the
+        distance of the shortest valid path between the position and the
+        enemy's position and enemy's objective. If there is a tie, the position
+        in the lowest row is chosen and if there is another tie, then the
+        position in the rightmost column is chosen. Enemies move in descending
+        priority order."""
+        enemies = [
+            entity
+            for entity in self._entities
+            if not entity.is_friendly()
+        ]
+
+        # Distances from each objective, shared by the enemies heading for it
+        # and kept up to date as they move rather than searched afresh
+        fields = {}
+
+        for enemy in enemies:
+            enemy = self._resolve(enemy)
+            valid_movement_positions = self.get_valid_movement_positions(enemy)
+            objective = enemy.get_objective()
+            if objective not in fields:
+                fields[objective] = _DistanceField(self, objective)
+            best_move = fields[objective].closest(
+                set(valid_movement_positions)
+            )
+
+            if best_move:
+                origin = enemy.get_position()
+                self._move_entity(enemy, best_move)
+                vacated = origin
+                if origin in self._entity_positions:
+                    vacated = None
+                for field in fields.values():
+                    field.update(vacated, best_move)
+
+    def make_attack(self, entity: Entity) -> None:
+        """Makes the given entity perform an attack against every tile that is
+        a target.
+
+        Parameters:
+            entity: The entity that is to make attacks.
+        """
+        entity = self._resolve(entity)
+        entity_positions = self._entity_positions
+        buildings = self._buildings
+        for target in self.get_attack_targets(entity):
+            building = buildings.get(target)
+            entity_target = entity_positions.get(target)
+            if building:
+                self._damage_building(target, entity.get_strength())
+            if entity_target:
+                self._attack_entity(entity, entity_target)
+
+    def preview_turn(self) -> TurnPreview:
+        """Returns the predicted outcome of calling end_turn now, without
+        changing the game. Previews are remembered by state hash, so asking
+        again before a move is made (or after moves are undone) costs a
+        dictionary lookup.
+        """
+        key = self.state_hash()
+        preview = self._previews.get(key)
+        if preview is None:
+            preview = self._previews[key] = self._compute_preview()
+            if len(self._previews) > PREVIEW_CACHE_SIZE:
+                del self._previews[next(iter(self._previews))]
+        return preview
+
+    def _compute_preview(self) -> TurnPreview:
+        """Returns the outcome of ending the turn on a fork of this game."""
+        outcome = self.fork()
+        # The fork is thrown away, so it need not keep a hash up to date
+        outcome._hash = None
+        # The fork's own copy of each entity, in the order of this game's,
+        # since end_turn forgets which entity each copy was made from
+        results = [outcome._own(entity) for entity in self._entities]
+        outcome.end_turn()
+
+        cell_damage = {}
+        after = outcome._buildings
+        for position, building in self._buildings.items():
+            damage = int(str(building)) - int(str(after[position]))
+            if damage:
+                cell_damage[position] = damage
+        entity_damage = {}
+        destinations = {}
+        for entity, result in zip(self._entities, results):
+            position = entity.get_position()
+            damage = entity.get_health() - result.get_health()
+            if damage:
+                entity_damage[position] = damage
+                cell_damage[position] = cell_damage.get(position, 0) + damage
+            if not entity.is_friendly() and result.is_alive():
+                destinations[position] = result.get_position()
+        return TurnPreview(cell_damage, entity_damage, destinations)
+
+    def end_turn(self, vectorized: bool = False) -> list[Entity]:
+        """Executes the attack and enemy movement phases and activates
+        all mechs.
+
+        Parameters:
+            vectorized: If True, the attack phase is resolved with NumPy array
+                        operations (see combat.compute_attack_damage) instead
+                        of one make_attack call per entity. The outcome is the
+                        same either way.
+
+        Returns:
+            list[Entity]: The entities that died during the attack phase, in
+                          descending priority order.
+        """
+        # The loops below change entities while walking the entity list, so
+        # it is copied up front rather than by the first change
+        self._unshare("_entities")
+        # Executes entity attacks
+        if vectorized:
+            # Imported here so that NumPy is only loaded when it is used
+            from breach.combat import CombatTable, compute_attack_damage
+            if self._combat_table is None:
+                self._combat_table = CombatTable(self)
+            entity_damage, building_damage = compute_attack_damage(
+                self,
+                self._combat_table
+            )
+            for entity, damage in entity_damage:
+                self._damage_entity(entity, damage)
+            for position, damage in building_damage:
+                self._damage_building(position, damage)
+        for entity in self._entities:
+            if not vectorized and entity.is_alive():
+                self.make_attack(entity)
+            if entity.get_name() in MECH_NAMES and not entity.is_active():
+                self._set_active(entity, True)
+        # Removes any dead entities
+        removed = self.remove_dead_entities()
+        # Moves from before the attack phase can no longer be undone
+        self._undo_stack.clear()
+        self._redo_stack.clear()
+        
+        self.assign_objectives()
+        self.move_enemies()
+        # With the journals gone, nothing needs the older versions of the
+        # entities copied this turn
+        self._aliases.clear()
+        return removed
+
+
+def _building_key(position: tuple[int, int], building: Building) -> int:
+    """Returns the Zobrist key of <building> at <position>."""
+    return _zobrist_key(
+        _BUILDING_TAG,
+        position[0],
+        position[1],
+        int(str(building))
+    )
+
+
+def _entity_key(entity: Entity) -> int:
+    """Returns the Zobrist key of <entity> in its current state."""
+    position = entity.get_position()
+    return _zobrist_key(
+        _ENTITY_TAG,
+        ord(entity.get_symbol()),
+        position[0],
+        position[1],
+        entity.get_health(),
+        entity.get_name() in MECH_NAMES and entity.is_active()
+    )
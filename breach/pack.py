@@ -0,0 +1,190 @@
+"""Level packs: many levels in one file, with an index for direct access.
+
+A pack holds each level in the same text layout as a level file, one after
+another, followed by an index of where each one starts:
+
+    header     HEADER: magic, version, #levels, offset of the index
+    levels     the text of each level, back to back
+    index      one INDEX_ENTRY (offset, length) per level
+
+All integers are little-endian. A LevelPack maps the file read-only, so
+fetching level k reads one index entry and parses only that level, and
+worker processes that open the same pack share its pages. Build a pack with
+write_pack, or from the command line with:
+
+    python -m breach.build_pack campaign.itbp levels/*.txt
+
+Individual levels in a pack are named "<pack>#<index>" wherever a level file
+is expected by simulate and batch, for example "campaign.itbp#12".
+"""
+import io
+import mmap
+import struct
+from functools import lru_cache
+from typing import Iterable, Iterator, Optional
+
+from breach.levels import LEVEL_CACHE_SIZE, LevelTemplate, parse_level
+
+PACK_EXTENSION = ".itbp"
+PACK_SEPARATOR = "#"
+MAGIC = b"ITBP"
+VERSION = 1
+# magic, version, level count, index offset
+HEADER = struct.Struct("<4sHIQ")
+# offset, length
+INDEX_ENTRY = struct.Struct("<QI")
+
+
+def write_pack(pack_file: str, level_files: Iterable[str]) -> int:
+    """Writes the levels in <level_files> to a new pack, one file at a time.
+
+    Parameters:
+        pack_file: The pack to write.
+        level_files: The level files to include, in order.
+
+    Returns:
+        int: The number of levels written.
+
+    Raises:
+        IOError: If a file cannot be opened.
+        LevelError: If a level file is malformed.
+    """
+    index = []
+    with open(pack_file, 'wb') as pack:
+        pack.write(HEADER.pack(MAGIC, VERSION, 0, 0))
+        for level_file in level_files:
+            with open(level_file, 'r') as file:
+                text = file.read()
+            # Checked up front so that a bad level fails the build, not a
+            # later game
+            parse_level(io.StringIO(text), level_file)
+            data = text.encode('ascii')
+            index.append((pack.tell(), len(data)))
+            pack.write(data)
+        index_offset = pack.tell()
+        for entry in index:
+            pack.write(INDEX_ENTRY.pack(*entry))
+        pack.seek(0)
+        pack.write(HEADER.pack(MAGIC, VERSION, len(index), index_offset))
+    return len(index)
+
+
+class LevelPack():
+    """Read-only, lazy access to the levels in a pack file."""
+
+    def __init__(self, pack_file: str) -> None:
+        """Opens the pack at <pack_file>.
+
+        Parameters:
+            pack_file: The pack to open.
+
+        Raises:
+            IOError: If the file cannot be opened.
+            ValueError: If the file is not a valid pack.
+        """
+        self._pack_file = pack_file
+        with open(pack_file, 'rb') as file:
+            try:
+                self._map = mmap.mmap(
+                    file.fileno(), 0, access=mmap.ACCESS_READ
+                )
+            except ValueError:
+                raise ValueError(f"{pack_file} is empty")
+        if len(self._map) < HEADER.size:
+            self.close()
+            raise ValueError(f"{pack_file} is not a level pack")
+        magic, version, self._count, self._index_offset = HEADER.unpack_from(
+            self._map
+        )
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{pack_file} is not a version {VERSION} pack")
+        if (self._index_offset + self._count * INDEX_ENTRY.size
+            != len(self._map)
+            ):
+            self.close()
+            raise ValueError(f"{pack_file} is truncated or corrupt")
+        self._get_template = lru_cache(maxsize=LEVEL_CACHE_SIZE)(
+            self._parse
+        )
+
+    def __len__(self) -> int:
+        """Returns the number of levels in the pack."""
+        return self._count
+
+    def __getitem__(self, index: int) -> LevelTemplate:
+        """Returns the parsed template of level <index>, parsing it the first
+        time it is needed.
+
+        Raises:
+            IndexError: If there is no such level.
+            LevelError: If the level is malformed.
+        """
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(f"{self._pack_file} has no level {index}")
+        return self._get_template(index)
+
+    def __iter__(self) -> Iterator[LevelTemplate]:
+        """Yields the template of each level in turn, parsing each one only
+        when it is reached."""
+        for index in range(self._count):
+            yield self[index]
+
+    def get_text(self, index: int) -> str:
+        """Returns the text of level <index>, in the level file layout.
+
+        Preconditions:
+            0 <= <index> < len(self)
+        """
+        offset, length = INDEX_ENTRY.unpack_from(
+            self._map,
+            self._index_offset + index * INDEX_ENTRY.size
+        )
+        return self._map[offset:offset + length].decode('ascii')
+
+    def _parse(self, index: int) -> LevelTemplate:
+        """Parses level <index>."""
+        return parse_level(
+            io.StringIO(self.get_text(index)),
+            f"{self._pack_file}{PACK_SEPARATOR}{index}"
+        )
+
+    def close(self) -> None:
+        """Unmaps the pack."""
+        self._map.close()
+
+    def __enter__(self) -> "LevelPack":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __getstate__(self) -> dict:
+        """Pickles a pack as its path, so that each process that receives it
+        maps the file itself."""
+        return {"pack_file": self._pack_file}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["pack_file"])
+
+
+@lru_cache(maxsize=LEVEL_CACHE_SIZE)
+def open_pack(pack_file: str) -> LevelPack:
+    """Returns the pack at <pack_file>, opening it only once per process.
+
+    Raises:
+        IOError: If the file cannot be opened.
+        ValueError: If the file is not a valid pack.
+    """
+    return LevelPack(pack_file)
+
+
+def split_level_name(level_file: str) -> Optional[tuple[str, int]]:
+    """Returns the (pack file, index) named by "<pack>#<index>", or None if
+    <level_file> does not name a level in a pack."""
+    pack_file, separator, index = level_file.rpartition(PACK_SEPARATOR)
+    if separator and pack_file.endswith(PACK_EXTENSION) and index.isdigit():
+        return pack_file, int(index)
+    return None
@@ -0,0 +1,79 @@
+"""Shortest path search over the game board."""
+import heapq
+from typing import Optional
+
+from breach.constants import PLUS_OFFSETS
+
+
+# Note: "" just allows type hint despite BreachModel not being defined in file.
+def get_distance(
+    game_state: "BreachModel",
+    origin: tuple[int, int],
+    destination: tuple[int, int],
+    max_distance: Optional[int] = None
+) -> int:
+    """
+    Computes the minimum taxicab distance between two points on a given board,
+    from all paths that avoid blocking tiles and other entities. The method may
+    begin on an entity or blocking tile, but will avoid all such tiles while
+    searching possible paths. This method requires you to have gotten up to the
+    BreachModel class, with correct get_board, get_entity, and entity_position
+    methods.
+
+    Args:
+        game_state (BreachModel): Model representing gamestate
+        origin (tuple[int,int]): starting position.
+        destination (tuple[int,int]): ending position. Precondition: will not be
+                                      a blocking tile according to game_state,
+                                      and will not posess an entity according to
+                                      game_state
+        max_distance (int, optional): if given, paths longer than this are not
+                                      explored and -1 is returned instead.
+
+    Returns:
+        int: taxicab distance of shortest path within the given game board
+             between origin and destination such that blocking tiles and entities
+             are avoided, or -1 if no such path exists.
+    """
+    # Implements A* search algorithm with a taxicab heuristic.
+    # NOTE: YOU DO NOT NEED TO UNDERSTAND THIS ALGORITHM
+    entity_tiles = game_state.entity_positions()
+    board = game_state.get_board()
+    get_tile = board.get_tile
+    rows, columns = board.get_dimensions()
+    dest_row, dest_col = destination
+
+    def heuristic(node: tuple[int, int]) -> int:
+        return abs(node[0] - dest_row) + abs(node[1] - dest_col)
+
+    # Initialise. Heap entries are (estimate, -distance, node) so that ties
+    # on the estimate are broken in favour of the deepest node.
+    best = {origin: 0}
+    frontier = [(heuristic(origin), 0, origin)]
+
+    while frontier:
+        estimate, negative_value, node = heapq.heappop(frontier)
+        value = -negative_value
+        if value > best[node]:
+            continue  # Stale entry for a node already reached more cheaply
+
+        if node == destination:
+            return value
+        # Add children to frontier
+        new_val = value + 1
+        for delta in PLUS_OFFSETS:
+            new_node = (node[0] + delta[0], node[1] + delta[1])
+            if (
+                0 <= new_node[0] < rows
+                and 0 <= new_node[1] < columns
+                and new_val < best.get(new_node, float("inf"))
+                and new_node not in entity_tiles
+                and not get_tile(new_node).is_blocking()
+            ):
+                new_estimate = new_val + heuristic(new_node)
+                if max_distance is None or new_estimate <= max_distance:
+                    best[new_node] = new_val
+                    heapq.heappush(frontier, (new_estimate, -new_val, new_node))
+
+    # We have run out of paths
+    return -1
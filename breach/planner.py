@@ -0,0 +1,263 @@
+"""Move search for the player's mechs.
+
+The planner looks for the set of mech moves this turn whose outcome, once the
+turn is ended, is best. A plan is a list of (from, to) moves, and the outcome
+of a plan is found by making its moves on a fork of the game and ending the
+turn on a fork of that. Outcomes are scored by the health of the buildings and
+mechs left standing and by the enemies killed or damaged.
+
+The search deepens one move at a time (plans of no moves, then one move, then
+two, ...) until every active mech has moved or the time budget runs out, and
+the best plan seen so far is always available. Moves are made and taken back
+with attempt_move and undo_move, and a transposition table keyed on the game's
+state hash means a state that can be reached by moving the mechs in more than
+one order is only searched once.
+"""
+import time
+from typing import Optional
+
+from breach.constants import *
+from breach.entities import Entity
+from breach.model import BreachModel
+
+# Seconds a plan may take by default
+DEFAULT_TIME_BUDGET = 1.0
+# Score of each remaining point of building health, point of mech health and
+# enemy killed, and the score lost per point of enemy health left
+BUILDING_WEIGHT = 3
+MECH_WEIGHT = 2
+KILL_WEIGHT = 5
+ENEMY_HEALTH_WEIGHT = 1
+# Score of a win (and, negated, of a loss), which outweighs everything else
+WIN_SCORE = 10000
+
+# A move of the mech at one (row, column) position to another
+Move = tuple[tuple[int, int], tuple[int, int]]
+
+
+class _OutOfTime(Exception):
+    """Raised inside the search when the time budget has run out."""
+
+
+def attack_value(
+    model: BreachModel,
+    mech: Entity,
+    position: tuple[int, int]
+) -> int:
+    """Returns how useful <mech>'s attack would be if it were at <position>:
+    one point for every enemy it damages (or friendly unit or building a
+    heal mech repairs), minus one for every friendly unit or building it
+    damages.
+
+    Parameters:
+        model: The current game.
+        mech: The mech to evaluate.
+        position: The (row, column) position to evaluate the mech at.
+    """
+    rows, columns = model.get_board().get_dimensions()
+    entity_positions = model.entity_positions()
+    buildings = model.get_buildings()
+    heals = mech.get_name() == HEAL_NAME
+    value = 0
+    for offset in model.get_attack_offsets(mech):
+        target = (position[0] + offset[0], position[1] + offset[1])
+        if not (0 <= target[0] < rows and 0 <= target[1] < columns):
+            continue
+        entity = entity_positions.get(target)
+        if entity is mech:
+            entity = None
+        if entity and entity.is_alive():
+            value += 1 if entity.is_friendly() == heals else -1
+        building = buildings.get(target)
+        if building and not building.is_destroyed():
+            value += 1 if heals else -1
+    return value
+
+
+def score_outcome(model: BreachModel) -> int:
+    """Returns the score of a game after its turn has been ended. Higher
+    scores are better for the player.
+
+    Parameters:
+        model: The game to score.
+    """
+    if model.has_lost():
+        return -WIN_SCORE
+    score = WIN_SCORE if model.has_won() else 0
+    for building in model.get_buildings().values():
+        score += BUILDING_WEIGHT * int(str(building))
+    for entity in model.get_entities():
+        if entity.is_friendly():
+            score += MECH_WEIGHT * entity.get_health()
+        else:
+            # Killed enemies have been removed, so each living one is a kill
+            # not made
+            score -= KILL_WEIGHT + ENEMY_HEALTH_WEIGHT * entity.get_health()
+    return score
+
+
+class Planner():
+    """Searches for the best moves for the player's mechs this turn."""
+
+    def __init__(
+        self,
+        time_budget: float = DEFAULT_TIME_BUDGET,
+        max_depth: Optional[int] = None
+    ) -> None:
+        """Constructs a planner.
+
+        Parameters:
+            time_budget: The number of seconds each call to plan may search
+                         for. The search always finishes scoring the plan of
+                         making no moves, however long that takes.
+            max_depth: The most moves a plan may have (default: one per
+                       active mech).
+        """
+        self._time_budget = time_budget
+        self._max_depth = max_depth
+        # Statistics of the most recent search: the number of states
+        # visited, the number of turn outcomes scored, and the deepest
+        # search that was completed
+        self.nodes = 0
+        self.evaluations = 0
+        self.depth = 0
+
+    def plan(self, model: BreachModel) -> list[Move]:
+        """Returns the best moves found for the active mechs in <model>, in
+        the order they should be made. <model> itself is not changed.
+
+        Parameters:
+            model: The game to plan for.
+
+        Returns:
+            list[Move]: The (from, to) position of each move. The list is
+                        empty if no moves were found that do better than
+                        ending the turn straight away.
+        """
+        self._deadline = time.perf_counter() + self._time_budget
+        # Transposition table of the most moves searched from each state,
+        # and the outcome score of each state
+        self._searched = {}
+        self._scores = {}
+        self._path = []
+        self.nodes = self.evaluations = self.depth = 0
+
+        game = model.fork()
+        mechs = sum(
+            entity.is_friendly() and entity.is_active()
+            for entity in game.get_entities()
+        )
+        max_depth = mechs if self._max_depth is None else min(
+            mechs,
+            self._max_depth
+        )
+        self._best_score = self._score(game, game.state_hash())
+        self._best_plan = []
+        try:
+            for depth in range(1, max_depth + 1):
+                self._search(game, depth)
+                self.depth = depth
+        except _OutOfTime:
+            pass
+        return self._best_plan
+
+    def _search(self, game: BreachModel, depth: int) -> None:
+        """Searches every plan of up to <depth> more moves from the current
+        state of <game>, recording the best one seen in _best_plan.
+
+        Parameters:
+            game: The game to search, which is left as it was found.
+            depth: The most moves to make.
+
+        Raises:
+            _OutOfTime: If the time budget runs out.
+        """
+        key = game.state_hash()
+        if self._searched.get(key, -1) >= depth:
+            return
+        self.nodes += 1
+        score = self._score(game, key)
+        if score > self._best_score:
+            self._best_score = score
+            self._best_plan = list(self._path)
+        if depth > 0:
+            for origin, position in _ordered_moves(game):
+                # Looked up afresh, since the game replaces shared mechs with
+                # copies as it changes them
+                game.attempt_move(game.entity_positions()[origin], position)
+                self._path.append((origin, position))
+                try:
+                    self._search(game, depth - 1)
+                finally:
+                    self._path.pop()
+                    game.undo_move()
+        self._searched[key] = depth
+
+    def _score(self, game: BreachModel, key: int) -> int:
+        """Returns the outcome score of ending the turn in the current state
+        of <game>, scoring each state only once.
+
+        Parameters:
+            game: The game to score, which is not changed.
+            key: The state hash of <game>.
+
+        Raises:
+            _OutOfTime: If the time budget has run out and this is not the
+                        first state scored.
+        """
+        score = self._scores.get(key)
+        if score is None:
+            if self.evaluations and time.perf_counter() > self._deadline:
+                raise _OutOfTime()
+            outcome = game.fork()
+            outcome.end_turn()
+            score = self._scores[key] = score_outcome(outcome)
+            self.evaluations += 1
+        return score
+
+
+def _ordered_moves(game: BreachModel) -> list[Move]:
+    """Returns every (from, to) move that can be made in <game>, with the
+    moves whose attacks look most useful first, so that good plans are found
+    early in the search.
+
+    Parameters:
+        game: The game to find the moves of.
+    """
+    moves = []
+    for entity in game.get_entities():
+        if entity.is_friendly() and entity.is_active():
+            origin = entity.get_position()
+            for position in game.get_valid_movement_positions(entity):
+                moves.append(
+                    (-attack_value(game, entity, position), origin, position)
+                )
+    moves.sort(key=lambda move: move[0])
+    return [(origin, position) for _, origin, position in moves]
+
+
+def plan_moves(
+    model: BreachModel,
+    time_budget: float = DEFAULT_TIME_BUDGET
+) -> list[Move]:
+    """Returns the best moves found for the active mechs in <model> within
+    <time_budget> seconds. See Planner.plan.
+
+    Parameters:
+        model: The game to plan for.
+        time_budget: The number of seconds to search for.
+    """
+    return Planner(time_budget).plan(model)
+
+
+def apply_plan(model: BreachModel, plan: list[Move]) -> None:
+    """Makes the moves in <plan> in <model>.
+
+    Parameters:
+        model: The game to make the moves in.
+        plan: The (from, to) position of each move, in order.
+    """
+    for origin, destination in plan:
+        entity = model.entity_positions().get(origin)
+        if entity:
+            model.attempt_move(entity, destination)
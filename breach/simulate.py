@@ -0,0 +1,319 @@
+"""Headless simulator that plays levels without the GUI.
+
+Each game loads a level file, lets a mech policy make its moves, ends the turn,
+and repeats until the game is won, lost or the turn limit is reached. One JSON
+line is written per game, for example:
+
+    python -m breach.simulate levels/level1.txt levels/level2.txt \
+        --policy greedy --games 100
+
+Policies:
+    pass: Never moves; every turn is ended straight away.
+    scripted: Plays the moves in a JSON file given with --moves. The file
+              holds one list per turn of [[row, col], [row, col]] moves,
+              from a mech's position to its destination.
+    greedy: Moves each mech to the position where its attack does the most
+            good this turn.
+    random: Moves each mech to a random valid position (or leaves it),
+            seeded by --seed.
+    planner: Searches for the moves with the best outcome once the turn is
+             ended (see breach.planner), for up to --time-budget seconds a
+             turn.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from typing import Callable, Optional
+
+from breach.constants import *
+from breach.binary import BINARY_EXTENSION, load_binary
+from breach.levels import load_level
+from breach.pack import open_pack, split_level_name
+from breach.model import BreachModel
+from breach.planner import (
+    DEFAULT_TIME_BUDGET, Planner, apply_plan, attack_value
+)
+
+DEFAULT_MAX_TURNS = 50
+WIN = "win"
+LOSS = "loss"
+UNFINISHED = "unfinished"
+
+# A policy makes the player's moves for the current turn
+Policy = Callable[[BreachModel], None]
+
+
+def pass_policy(model: BreachModel) -> None:
+    """A policy that never moves any mechs."""
+
+
+def greedy_policy(model: BreachModel) -> None:
+    """A policy that moves each active mech, in priority order, to the
+    position with the best attack value this turn. Mechs stay put unless
+    moving is strictly better."""
+    for entity in list(model.get_entities()):
+        if entity.is_friendly() and entity.is_active():
+            best_position = entity.get_position()
+            best_value = attack_value(model, entity, best_position)
+            for position in model.get_valid_movement_positions(entity):
+                value = attack_value(model, entity, position)
+                if value > best_value:
+                    best_position, best_value = position, value
+            if best_position != entity.get_position():
+                model.attempt_move(entity, best_position)
+
+
+def random_policy(seed: Optional[int] = None) -> Policy:
+    """Returns a policy that moves each active mech to a random valid
+    position, or leaves it where it is.
+
+    Parameters:
+        seed: Seed for the random choices.
+    """
+    rng = random.Random(seed)
+
+    def policy(model: BreachModel) -> None:
+        for entity in list(model.get_entities()):
+            if entity.is_friendly() and entity.is_active():
+                choices = [None] + model.get_valid_movement_positions(entity)
+                position = rng.choice(choices)
+                if position is not None:
+                    model.attempt_move(entity, position)
+
+    return policy
+
+
+def scripted_policy(turns: list[list[list[list[int]]]]) -> Policy:
+    """Returns a policy that plays a fixed list of moves.
+
+    Parameters:
+        turns: One list of moves per turn, where each move is
+               [[row, col], [row, col]] from a mech's position to its
+               destination. Turns past the end of the list make no moves.
+    """
+    remaining = iter(turns)
+
+    def policy(model: BreachModel) -> None:
+        for origin, destination in next(remaining, []):
+            entity = model.entity_positions().get(tuple(origin))
+            if entity:
+                model.attempt_move(entity, tuple(destination))
+
+    return policy
+
+
+def planner_policy(time_budget: float = DEFAULT_TIME_BUDGET) -> Policy:
+    """Returns a policy that makes the moves found by a Planner.
+
+    Parameters:
+        time_budget: The number of seconds to search for each turn.
+    """
+    planner = Planner(time_budget)
+
+    def policy(model: BreachModel) -> None:
+        apply_plan(model, planner.plan(model))
+
+    return policy
+
+
+def make_policy(
+    name: str,
+    seed: Optional[int] = None,
+    moves_file: Optional[str] = None,
+    time_budget: float = DEFAULT_TIME_BUDGET
+) -> Policy:
+    """Returns a new instance of the named policy.
+
+    Parameters:
+        name: One of the names in POLICIES.
+        seed: Seed for policies that make random choices.
+        moves_file: The JSON move list for the scripted policy.
+        time_budget: The number of seconds the planner policy searches for
+                     each turn.
+
+    Raises:
+        ValueError: If the policy name is unknown, or the scripted policy is
+                    requested without a moves file.
+    """
+    if name == "pass":
+        return pass_policy
+    if name == "greedy":
+        return greedy_policy
+    if name == "random":
+        return random_policy(seed)
+    if name == "planner":
+        return planner_policy(time_budget)
+    if name == "scripted":
+        if moves_file is None:
+            raise ValueError("The scripted policy needs a moves file")
+        with open(moves_file) as file:
+            return scripted_policy(json.load(file))
+    raise ValueError(f"Unknown policy: {name}")
+
+
+POLICIES = ("pass", "scripted", "greedy", "random", "planner")
+
+
+def load_model(level_file: str, compact: bool = False) -> BreachModel:
+    """Returns a new game loaded from <level_file>, which is a binary save
+    if its name ends in BINARY_EXTENSION, or a level in a pack if it is named
+    "<pack>#<index>". Text levels are parsed once and then created from the
+    cached template.
+
+    Parameters:
+        level_file: The level file to load.
+        compact: If True, the board is a CompactBoard.
+    """
+    if level_file.endswith(BINARY_EXTENSION):
+        return load_binary(level_file, compact)
+    pack_level = split_level_name(level_file)
+    if pack_level:
+        pack_file, index = pack_level
+        return open_pack(pack_file)[index].create_model(compact)
+    return load_level(level_file).create_model(compact)
+
+
+def play(
+    model: BreachModel,
+    policy: Policy,
+    max_turns: int = DEFAULT_MAX_TURNS,
+    vectorized: bool = False
+) -> dict:
+    """Plays <model> to completion (or <max_turns> turns) under <policy>.
+
+    Parameters:
+        model: The game to play. It is modified in place.
+        policy: The policy that makes the player's moves each turn.
+        max_turns: The maximum number of turns to play.
+        vectorized: Passed on to BreachModel.end_turn.
+
+    Returns:
+        dict: The result (WIN, LOSS or UNFINISHED), the number of turns
+              taken, the wall time in seconds of each turn, and the number
+              of buildings and mechs left standing compared to the start.
+    """
+    initial_buildings = _standing_buildings(model)
+    initial_mechs = _living_mechs(model)
+    turn_times = []
+    result = UNFINISHED
+    while len(turn_times) < max_turns:
+        start = time.perf_counter()
+        policy(model)
+        model.end_turn(vectorized)
+        turn_times.append(time.perf_counter() - start)
+        if model.has_won():
+            result = WIN
+            break
+        if model.has_lost():
+            result = LOSS
+            break
+    return {
+        "result": result,
+        "turns": len(turn_times),
+        "turn_times": turn_times,
+        "buildings": _standing_buildings(model),
+        "initial_buildings": initial_buildings,
+        "mechs": _living_mechs(model),
+        "initial_mechs": initial_mechs
+    }
+
+
+def _standing_buildings(model: BreachModel) -> int:
+    """Returns the number of buildings in <model> that are not destroyed."""
+    return sum(
+        not building.is_destroyed()
+        for building in model.get_buildings().values()
+    )
+
+
+def _living_mechs(model: BreachModel) -> int:
+    """Returns the number of living mechs in <model>."""
+    return sum(
+        entity.get_name() in MECH_NAMES and entity.is_alive()
+        for entity in model.get_entities()
+    )
+
+
+def run_game(
+    level_file: str,
+    policy_name: str,
+    seed: Optional[int] = None,
+    moves_file: Optional[str] = None,
+    max_turns: int = DEFAULT_MAX_TURNS,
+    compact: bool = False,
+    vectorized: bool = False,
+    time_budget: float = DEFAULT_TIME_BUDGET
+) -> dict:
+    """Loads and plays a single game, returning the record written for it.
+
+    Parameters:
+        level_file: The level file to play.
+        policy_name: The name of the mech policy to use.
+        seed: Seed for policies that make random choices.
+        moves_file: The JSON move list for the scripted policy.
+        max_turns: The maximum number of turns to play.
+        compact: If True, the board is a CompactBoard.
+        vectorized: Passed on to BreachModel.end_turn.
+        time_budget: The number of seconds the planner policy searches for
+                     each turn.
+    """
+    record = {"level": level_file, "policy": policy_name, "seed": seed}
+    model = load_model(level_file, compact)
+    policy = make_policy(policy_name, seed, moves_file, time_budget)
+    record.update(play(model, policy, max_turns, vectorized))
+    return record
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Runs the simulator from the command line."""
+    parser = argparse.ArgumentParser(
+        description="Play Into The Breach levels without the GUI."
+    )
+    parser.add_argument("levels", nargs="+", help="level files to play")
+    parser.add_argument("--policy", choices=POLICIES, default="pass")
+    parser.add_argument("--moves", help="JSON move list for --policy scripted")
+    parser.add_argument(
+        "--games",
+        type=int,
+        default=1,
+        help="games to play per level (seeds --seed, --seed + 1, ...)"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-turns", type=int, default=DEFAULT_MAX_TURNS)
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="use CompactBoard"
+    )
+    parser.add_argument(
+        "--vectorized",
+        action="store_true",
+        help="resolve attacks with NumPy"
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        default=DEFAULT_TIME_BUDGET,
+        help="seconds the planner policy searches for each turn"
+    )
+    args = parser.parse_args(argv)
+
+    for level_file in args.levels:
+        for game in range(args.games):
+            record = run_game(
+                level_file,
+                args.policy,
+                args.seed + game,
+                args.moves,
+                args.max_turns,
+                args.compact,
+                args.vectorized,
+                args.time_budget
+            )
+            sys.stdout.write(json.dumps(record) + "\n")
+
+
+if __name__ == "__main__":
+    main()
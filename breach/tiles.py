@@ -0,0 +1,102 @@
+"""The tiles that make up the board."""
+from breach.constants import *
+
+
+class Tile():
+    """The parent class for all tiles in the game that provides the basic
+    tile behaviour."""
+    
+    def __init__(self) -> None:
+        """Constructor for the tile."""
+        self._symbol = TILE_SYMBOL
+        self._name = TILE_NAME
+        self._is_blocking = False
+
+    def __repr__(self) -> str:
+        """Returns a representation of the tile that can be used
+        to create an identical instance of itself."""
+        return f'{self._name}()'
+
+    def __str__(self) -> str:
+        """Returns the symbol that represents the tile."""
+        return self._symbol
+
+    def get_tile_name(self) -> str:
+        """Returns the name of the tile type."""
+        return self._name
+
+    def is_blocking(self) -> bool:
+        """Returns a boolean corresponding to whether a tile is blocking
+        or not."""
+        return self._is_blocking
+    
+
+class Ground(Tile):
+    """The class representing a ground tile."""
+
+    def __init__(self) -> None:
+        """Constructor for the ground tile."""
+        super().__init__()
+        self._symbol = GROUND_SYMBOL
+        self._name = GROUND_NAME
+
+
+class Mountain(Tile):
+    """The class representing a mountain tile."""
+
+    def __init__(self) -> None:
+        """Constructor for the mountain tile."""
+        self._symbol = MOUNTAIN_SYMBOL
+        self._name = MOUNTAIN_NAME
+        self._is_blocking = True
+
+
+class Building(Tile):
+    """The class representing a building tile - the tile to be protected by
+    the player."""
+
+    def __init__(self, initial_health: int) -> None:
+        """Constructs a building tile with the specified health.
+
+        Parameters:
+            initial_health: The initial health of the building.
+
+        Preconditions:
+            <initial_health> will be between 0 and 9 inclusive.
+        """
+        self._name = BUILDING_NAME
+        self._health = initial_health
+
+    def __repr__(self) -> str:
+        """Returns the representation of the building that can be used to
+        create an identical instance."""
+        return f'{self._name}({self._health})'
+
+    def __str__(self) -> str:
+        """Returns the string representation of the building."""
+        return str(self._health)
+
+    def is_destroyed(self) -> bool:
+        """Returns a boolean stating whether the given building has been
+        destroyed or not."""
+        return not self._health
+
+    def is_blocking(self) -> bool:
+        """Returns whether or not the building is blocking."""
+        return self._health > 0
+
+    def damage(self, damage: int) -> None:
+        """Reduces the health of a non-destroyed building by <damage>, then
+        rounds health up to 0 or down to MAX_BUILDING_HEALTH if it is < 0
+        or > MAX_BUILDING_HEALTH respectively.
+
+        Parameters:
+            damage: The amount to reduce the building's health by.
+        """
+        if self._health:
+            self._health -= damage
+            # Keeps the health value between 0 and MAX_BUILDING_HEALTH
+            if self._health > MAX_BUILDING_HEALTH:
+                self._health = MAX_BUILDING_HEALTH
+            elif self._health < 0:
+                self._health = 0